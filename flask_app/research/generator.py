@@ -1,11 +1,9 @@
 from transformers import pipeline
-import re
 
 def clean_text(text):
-    # Remove extra whitespace and newlines
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
-    return text
+    # Remove extra whitespace and newlines; str.split() with no argument splits
+    # on the same Unicode whitespace as \s+ and drops the ends, so no strip pass
+    return ' '.join(text.split())
 
 def generate_article(research_data):
     # Initialize the summarization pipeline
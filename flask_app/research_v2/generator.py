@@ -2,18 +2,140 @@
 Enhanced article generation module with improved content validation and expansion.
 Fixes prompt leaking and ensures proper paragraph structure.
 """
-from transformers import pipeline
+import io
 import re
 import random
-from typing import List, Dict, Optional, Set
+import string
+from functools import lru_cache
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime
+from pathlib import Path
 import logging
 import hashlib
+import sqlite3
+import time
+
+try:
+    from rbloom import Bloom
+except ImportError:  # optional: dedup falls back to the exact per-article set
+    Bloom = None
+
+try:
+    import xxhash
+except ImportError:  # optional: content hashing falls back to hashlib.blake2b
+    xxhash = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Loaded summarization pipelines, keyed on (model_name, quantize), shared by
+# every generator in the process so the model is only loaded once
+_SUMMARIZERS: Dict[Tuple[str, bool], object] = {}
+
+
+# Bloom filter of every content hash used by any generator in the process
+# (and of every persisted hash loaded); a miss proves the hash is in no
+# in-memory dedup set, so those lookups can be skipped. The hash store is
+# still consulted, since other processes write to it. Shared so each
+# generator does not allocate its own ~3.6 MB; an article uses about a dozen
+# hashes, so 1M holds thousands of articles before it grows less selective,
+# and even then a hit only falls through to the exact checks
+_SEEN_HASHES = Bloom(1_000_000, 1e-6) if Bloom is not None else None
+
+
+def clear_summarizer_cache():
+    """Drop the shared summarization pipelines."""
+    _SUMMARIZERS.clear()
+
+
+# Codepoints kept as-is in slugs; everything else becomes '-'
+_SLUG_KEEP = frozenset(map(ord, string.ascii_lowercase + string.digits))
+
+
+class _SlugTable(dict):
+    """str.translate table mapping every character that is not [a-z0-9] to '-'.
+
+    Entries are filled in on first use, so any codepoint (curly quotes,
+    dashes, non-Latin scripts) is covered, not just Latin-1.
+    """
+
+    def __missing__(self, codepoint: int):
+        value = codepoint if codepoint in _SLUG_KEEP else '-'
+        self[codepoint] = value
+        return value
+
+
+_SLUG_TABLE = _SlugTable()
+
+
+def _slugify(name: str) -> str:
+    """Lowercase a name and collapse non-alphanumeric runs into single hyphens."""
+    return '-'.join(part for part in name.lower().translate(_SLUG_TABLE).split('-') if part)
+
+
+_FRONT_MATTER_TMPL = """---
+layout: post
+title: "{title}"
+date: {date}
+categories: [south-african-plants, botanical-guide]
+tags: [flora, indigenous, conservation, ecology]
+plant_name: "{plant_name}"
+slug: "{slug}"
+featured_image: "/assets/images/plants/{slug}.jpg"
+description: "Explore {plant_name}, a remarkable South African plant species with unique adaptations and ecological significance."
+author: "Botanical Research Team"
+---
+
+"""
+
+
+@lru_cache(maxsize=256)
+def _build_front_matter(plant_name: str, title: str, current_date: str) -> str:
+    """Build Jekyll front matter; cached since the same plant/title pair is regenerated."""
+    return _FRONT_MATTER_TMPL.format(title=title, date=current_date,
+                                     plant_name=plant_name, slug=_slugify(plant_name))
+
+
+# Article title templates; "{p}" is replaced with the plant name
+_TITLE_TEMPLATES: Tuple[str, ...] = (
+    "{p}: A Remarkable South African Plant Species",
+    "Discovering {p}: Botanical Treasures of South Africa",
+    "{p}: Unique Adaptations in South African Flora",
+    "The Fascinating World of {p}: South African Botanical Heritage",
+)
+
+
+# Template paragraphs per section type; "{p}" is replaced with the plant name
+_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    'introduction': (
+        "{p} represents one of South Africa's most distinctive indigenous plant species. This remarkable succulent has evolved unique characteristics that allow it to thrive in the challenging conditions of the country's arid regions. Its specialized adaptations showcase the incredible diversity of South African flora.",
+        "Endemic to specific regions of South Africa, {p} has captured the attention of botanists and plant enthusiasts worldwide. The species demonstrates remarkable resilience and has developed fascinating survival strategies over millennia of evolution.",
+        "As part of South Africa's rich botanical heritage, {p} contributes to the country's status as one of the world's most biodiverse nations. Its unique characteristics make it a subject of ongoing scientific study and conservation interest."
+    ),
+    'characteristics': (
+        "{p} exhibits distinctive morphological features that set it apart from other succulent species. Its compact, button-like form represents a highly specialized adaptation to extreme environmental conditions, with thick, fleshy leaves that efficiently store water during prolonged dry periods.",
+        "The plant's unique structure includes specialized tissues that can expand and contract based on water availability. During favorable conditions, the leaves become plump and rounded, while in drought periods they may appear more wrinkled and withdrawn, demonstrating remarkable physiological flexibility.",
+        "Color variations in {p} range from subtle green tones to more vibrant hues, often influenced by environmental factors such as light exposure and seasonal changes. The plant's surface texture and patterns create intricate geometric designs that serve both functional and aesthetic purposes in nature."
+    ),
+    'habitat': (
+        "{p} inhabits the specialized ecosystems of South Africa's arid interior regions. These environments are characterized by extreme temperature fluctuations, minimal rainfall, and intense solar radiation, conditions that have shaped the plant's remarkable adaptations over thousands of years.",
+        "The natural habitat of {p} typically features rocky outcrops, quartzite substrates, and well-draining mineral soils. These geological formations provide the perfect combination of drainage, protection, and mineral nutrients that the species requires for optimal growth and reproduction.",
+        "Seasonal patterns in the plant's native range include brief but intense rainfall periods followed by extended dry seasons. {p} has evolved to maximize water uptake during these short favorable periods while maintaining metabolic functions throughout the challenging dry months."
+    ),
+    'cultural': (
+        "{p} holds special significance in South Africa's botanical and cultural landscape. Indigenous communities have long recognized the unique properties of this remarkable plant, incorporating knowledge of its characteristics into traditional ecological wisdom passed down through generations.",
+        "The species serves as an important indicator of ecosystem health in its native habitat. Local conservation efforts increasingly recognize {p} as a flagship species for protecting the unique biodiversity of South Africa's succulent regions.",
+        "Modern horticultural interest in {p} has led to its cultivation by specialized growers worldwide. This attention helps raise awareness of South Africa's remarkable succulent diversity and supports conservation initiatives in the plant's natural habitat."
+    ),
+    'conservation': (
+        "{p} faces various conservation challenges typical of South Africa's specialized succulent flora. Habitat degradation, climate change impacts, and collection pressures contribute to concerns about the long-term survival of wild populations.",
+        "Protection efforts for {p} focus on habitat preservation and sustainable management of natural populations. These initiatives involve collaboration between conservation organizations, research institutions, and local communities to ensure effective protection strategies.",
+        "The species benefits from inclusion in specialized botanical collections and research programs that study South African succulents. These ex-situ conservation efforts complement habitat protection and contribute valuable scientific knowledge about the plant's biology and ecology."
+    ),
+}
+
+
 class ContentCleaner:
     """Cleans generated content to remove prompt artifacts and improve quality"""
     
@@ -52,28 +174,26 @@ class ContentCleaner:
         r'thus,?\s*',
     ]
 
+    # Compiled once at class creation so clean_content never re-parses patterns
+    _ARTIFACT_RES = tuple(re.compile(p, re.IGNORECASE) for p in PROMPT_ARTIFACTS)
+    _FILLER_RES = tuple(re.compile(f'^{p}', re.IGNORECASE) for p in FILLER_PHRASES)
+    # Benchmarked against a hand-rolled character scan, which was 2-3x slower
+    # on paragraph-length text; the compiled split stays
+    _SENT_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
     @classmethod
     def clean_content(cls, text: str) -> str:
         """Remove prompt artifacts and clean up content"""
         if not text:
             return ""
         
-        # Convert to lowercase for pattern matching but preserve original case
-        text_lower = text.lower()
+        # Remove prompt artifacts (case-insensitive, applied in order)
         cleaned = text
-        
-        # Remove prompt artifacts
-        for pattern in cls.PROMPT_ARTIFACTS:
-            # Find matches in lowercase version
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-            for match in reversed(list(matches)):  # Reverse to maintain indices
-                start, end = match.span()
-                # Remove from original text
-                cleaned = cleaned[:start] + cleaned[end:]
-                text_lower = text_lower[:start] + text_lower[end:]
+        for pattern in cls._ARTIFACT_RES:
+            cleaned = pattern.sub('', cleaned)
         
         # Clean up excessive filler phrases at sentence starts
-        sentences = re.split(r'(?<=[.!?])\s+', cleaned)
+        sentences = cls._SENT_SPLIT.split(cleaned)
         clean_sentences = []
         
         for sentence in sentences:
@@ -82,8 +202,8 @@ class ContentCleaner:
                 continue
                 
             # Remove filler phrases from sentence start
-            for filler_pattern in cls.FILLER_PHRASES:
-                sentence = re.sub(f'^{filler_pattern}', '', sentence, flags=re.IGNORECASE).strip()
+            for filler_re in cls._FILLER_RES:
+                sentence = filler_re.sub('', sentence).strip()
             
             # Ensure sentence starts with capital letter
             if sentence and sentence[0].islower():
@@ -118,75 +238,262 @@ class TopicValidator:
                         'preservation', 'biodiversity', 'ecosystem', 'sustainability']
     }
 
+    # Single-word keywords are matched by looking each of the text's tokens up
+    # in a table of their inflected forms (plurals and possessives, which
+    # botanical prose mostly uses: 'flowers', 'leaves', 'families') mapped back
+    # to the keyword; the few multi-word keywords share one compiled alternation
+    _KEYWORD_FORMS: Dict[str, str] = {}
+    for _kw in (kw for kws in BOTANICAL_KEYWORDS.values() for kw in kws if ' ' not in kw):
+        _KEYWORD_FORMS[_kw] = _kw
+    for _kw in list(_KEYWORD_FORMS):
+        _forms = [_kw + 's', _kw + 'es', _kw + "'s", _kw + "s'"]
+        if _kw.endswith('y') and _kw[-2] not in 'aeiou':
+            _forms.append(_kw[:-1] + 'ies')
+        if _kw.endswith('f'):
+            _forms.append(_kw[:-1] + 'ves')
+        for _form in _forms:
+            _KEYWORD_FORMS.setdefault(_form, _kw)
+    del _kw, _forms, _form
+    _MULTI_KEYWORDS_RE = re.compile('|'.join(sorted(
+        {re.escape(kw) for kws in BOTANICAL_KEYWORDS.values() for kw in kws if ' ' in kw})))
+    _TOTAL_KEYWORDS = sum(len(kws) for kws in BOTANICAL_KEYWORDS.values())
+    # Smallest integer score whose ratio to the keyword total reaches 0.15
+    _SCORE_THRESHOLD = 1
+    while _SCORE_THRESHOLD / max(_TOTAL_KEYWORDS * 0.1, 1) < 0.15:
+        _SCORE_THRESHOLD += 1
+    _WORD_RE = re.compile(r"[a-z']+")
+
+    # Plant-related phrasing in one pass; each group that matches is worth a bonus
+    _PLANT_PATTERNS_RE = re.compile(
+        r'\b(?:(?P<growth>grows?|flowering|blooms?|native to|found in)'
+        r'|(?P<habit>evergreen|perennial|annual|deciduous)'
+        r'|(?P<cultivation>cultivation|propagation|gardening))\b'
+    )
+
     @classmethod
+    @lru_cache(maxsize=4096)
     def is_botanical_content(cls, text: str, plant_name: str = '') -> bool:
-        """Check if content is botanically relevant"""
+        """Check if content is botanically relevant (memoized per text and plant)"""
         if not text or len(text.strip()) < 20:
             return False
 
         text_lower = text.lower()
-        
-        # Count botanical relevance indicators
-        botanical_score = 0
-        total_keywords = 0
+        plant_name_lower = plant_name.lower()
 
-        for category, keywords in cls.BOTANICAL_KEYWORDS.items():
-            total_keywords += len(keywords)
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    botanical_score += 1
+        # The relevance ratio's denominator is a class constant, so the check
+        # reduces to an integer score threshold; return as soon as it is met,
+        # cheapest indicators first
+        threshold = cls._SCORE_THRESHOLD
 
         # Check if plant name is mentioned
-        if plant_name and plant_name.lower() in text_lower:
+        botanical_score = 0
+        if plant_name_lower and plant_name_lower in text_lower:
             botanical_score += 3
+            if botanical_score >= threshold:
+                return True
 
         # Check for plant-related patterns
-        plant_patterns = [
-            r'\b(grows?|flowering|blooms?|native to|found in)\b',
-            r'\b(evergreen|perennial|annual|deciduous)\b',
-            r'\b(cultivation|propagation|gardening)\b'
-        ]
-
-        for pattern in plant_patterns:
-            if re.search(pattern, text_lower):
-                botanical_score += 2
+        pattern_groups = set()
+        for match in cls._PLANT_PATTERNS_RE.finditer(text_lower):
+            pattern_groups.add(match.lastgroup)
+            if botanical_score + 2 * len(pattern_groups) >= threshold:
+                return True
+        botanical_score += 2 * len(pattern_groups)
 
-        relevance_ratio = botanical_score / max(total_keywords * 0.1, 1)
-        return relevance_ratio >= 0.15
+        # Count botanical relevance indicators
+        keywords_found = set()
+        for match in cls._WORD_RE.finditer(text_lower):
+            keyword = cls._KEYWORD_FORMS.get(match.group())
+            if keyword is not None and keyword not in keywords_found:
+                keywords_found.add(keyword)
+                if botanical_score + len(keywords_found) >= threshold:
+                    return True
+        for match in cls._MULTI_KEYWORDS_RE.finditer(text_lower):
+            keywords_found.add(match.group())
+            if botanical_score + len(keywords_found) >= threshold:
+                return True
+
+        return False
 
 class ExpandedArticleGenerator:
     """Article generator with expanded sections and no prompt leaking"""
 
-    def __init__(self, model_name: str = "facebook/bart-large-cnn"):
+    # How far into a research item the plant name must appear
+    PLANT_NAME_PREFIX_CHARS = 512
+    # How much of a section's source material is fed to the summarizer
+    SUMMARY_INPUT_CHARS = 400
+
+    def __init__(self, model_name: str = "facebook/bart-large-cnn",
+                 hash_db_path: Optional[str] = None, hash_ttl: Optional[float] = None,
+                 quantize: bool = False, onnx_cache_dir: str = "onnx_models"):
+        """
+        Args:
+            model_name: HuggingFace summarization model to load
+            hash_db_path: Optional SQLite file that persists used content hashes,
+                so snippets are not reused across articles or server restarts
+            hash_ttl: Optional age in seconds after which persisted hashes expire
+            quantize: Run the model as an INT8-quantized ONNX export via
+                optimum[onnxruntime]; falls back to the FP32 pipeline if unavailable
+            onnx_cache_dir: Where the exported and quantized ONNX model is cached
+        """
         self.model_name = model_name
+        self.quantize = quantize
+        self.onnx_cache_dir = onnx_cache_dir
         self.summarizer = None
         self.used_content_hashes = set()
+        self._global_seen = _SEEN_HASHES
+        self.hash_ttl = hash_ttl
+        self._hash_db = None
+        if hash_db_path:
+            self._open_hash_db(hash_db_path)
         self.topic_validator = TopicValidator()
         self.content_cleaner = ContentCleaner()
         self._load_model()
 
+    def _open_hash_db(self, path: str):
+        """Open the persistent store of content hashes used by earlier articles."""
+        self._hash_db = sqlite3.connect(path, check_same_thread=False)
+        self._hash_db.execute('CREATE TABLE IF NOT EXISTS seen (h INTEGER PRIMARY KEY, ts REAL)')
+        if self.hash_ttl:
+            self._hash_db.execute('DELETE FROM seen WHERE ts < ?', (time.time() - self.hash_ttl,))
+            self._hash_db.commit()
+
+        # Keep the Bloom filter a superset of the store so its misses stay exact
+        if self._global_seen is not None:
+            for (content_hash,) in self._hash_db.execute('SELECT h FROM seen'):
+                self._global_seen.add(content_hash)
+
+    def _seen_in_db(self, content_hash: int) -> bool:
+        """Check whether a content hash was persisted by an earlier article."""
+        if self._hash_db is None:
+            return False
+        if self.hash_ttl:
+            row = self._hash_db.execute('SELECT 1 FROM seen WHERE h = ? AND ts >= ?',
+                                        (content_hash, time.time() - self.hash_ttl)).fetchone()
+        else:
+            row = self._hash_db.execute('SELECT 1 FROM seen WHERE h = ?', (content_hash,)).fetchone()
+        return row is not None
+
+    def _persist_hashes(self, hashes: Set[int]):
+        """Record the hashes used by a section in one batched write."""
+        if self._hash_db is None or not hashes:
+            return
+        now = time.time()
+        self._hash_db.executemany('INSERT OR REPLACE INTO seen (h, ts) VALUES (?, ?)',
+                                  [(content_hash, now) for content_hash in hashes])
+        self._hash_db.commit()
+
     def _load_model(self):
         """Load the AI summarization model with error handling."""
+        key = (self.model_name, self.quantize)
+        if key in _SUMMARIZERS:
+            self.summarizer = _SUMMARIZERS[key]
+            return
         try:
             logger.info(f"Loading AI model: {self.model_name}")
-            self.summarizer = pipeline("summarization", model=self.model_name)
+            self.summarizer = self._load_quantized_pipeline() if self.quantize else None
+            if self.summarizer is None:
+                # Imported here so importing this module (titles, front matter,
+                # template fallback) does not pull in transformers and torch
+                from transformers import pipeline
+                self.summarizer = pipeline("summarization", model=self.model_name)
+            _SUMMARIZERS[key] = self.summarizer
             logger.info("Model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load model: {str(e)}")
             logger.info("Falling back to template-based generation")
             self.summarizer = None
 
-    def _hash_content(self, content: str) -> str:
-        """Generate a hash for content to detect duplicates."""
-        return hashlib.md5(content.encode()).hexdigest()
+    def _load_quantized_pipeline(self):
+        """Build a summarization pipeline on an INT8 dynamically-quantized ONNX model.
+
+        The export and quantization run once; later loads reuse the cached files.
+        Returns None when optimum/onnxruntime is missing or the export fails.
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            from transformers import AutoTokenizer, pipeline
+        except ImportError:
+            logger.info("optimum[onnxruntime] not installed, using the FP32 model")
+            return None
+
+        try:
+            model_dir = Path(self.onnx_cache_dir) / self.model_name.replace('/', '--')
+            export_dir = model_dir / 'onnx'
+            quantized_dir = model_dir / 'onnx-int8'
+
+            if not quantized_dir.is_dir():
+                logger.info(f"Exporting {self.model_name} to ONNX and quantizing to INT8")
+                ORTModelForSeq2SeqLM.from_pretrained(self.model_name, export=True).save_pretrained(export_dir)
+                AutoTokenizer.from_pretrained(self.model_name).save_pretrained(export_dir)
+
+                # Dynamic quantization uses VNNI int8 dot products on x86
+                qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+                for onnx_file in sorted(export_dir.glob('*.onnx')):
+                    quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=onnx_file.name)
+                    quantizer.quantize(save_dir=quantized_dir, quantization_config=qconfig)
+                AutoTokenizer.from_pretrained(export_dir).save_pretrained(quantized_dir)
+
+            file_names = {
+                f"{part}_file_name": f"{part}_model_quantized.onnx"
+                for part in ('encoder', 'decoder', 'decoder_with_past')
+                if (quantized_dir / f"{part}_model_quantized.onnx").exists()
+            }
+            model = ORTModelForSeq2SeqLM.from_pretrained(quantized_dir, **file_names)
+            tokenizer = AutoTokenizer.from_pretrained(quantized_dir)
+            return pipeline("summarization", model=model, tokenizer=tokenizer)
+        except Exception as e:
+            logger.warning(f"Quantized model unavailable, using the FP32 model: {str(e)}")
+            return None
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _hash_content(content: str) -> int:
+        """Generate a 64-bit hash for content to detect duplicates.
+
+        The value is stable across processes (unlike hash()) so it can be
+        persisted, and signed so it fits an SQLite INTEGER.
+        """
+        data = content.encode()
+        if xxhash is not None:
+            value = xxhash.xxh3_64_intdigest(data)
+            return value - (1 << 64) if value >= (1 << 63) else value
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big', signed=True)
+
+    def _is_duplicate(self, content_hash: int, local_used_hashes: Set[int]) -> bool:
+        """Check whether a content hash was already used in this or an earlier article."""
+        if self._global_seen is not None and content_hash not in self._global_seen:
+            # A miss proves the hash is in no set of this process, but other
+            # workers may have persisted it since; only the store can say
+            return self._seen_in_db(content_hash)
+        return (content_hash in self.used_content_hashes or content_hash in local_used_hashes
+                or self._seen_in_db(content_hash))
 
     def extract_relevant_content(self, research_data: List[Dict], plant_name: str, 
-                               section_type: str, max_items: int = 3) -> str:
-        """Extract content that is relevant to the plant and section type."""
+                               section_type: str, max_items: int = 3,
+                               max_chars: Optional[int] = None) -> str:
+        """Extract content that is relevant to the plant and section type.
+
+        When max_chars is given only that many characters are returned. Items
+        are taken until the budget is spent; later matches are left unmarked
+        so the following sections can still use them.
+        """
         relevant_content = []
+        remaining = max_chars
         local_used_hashes = set()
 
+        # Plant names are ASCII, so match on lowercased UTF-8 bytes; bytes.lower()
+        # skips the Unicode case tables that str.lower() has to consult
+        plant_name_lower = plant_name.lower()
+        plant_terms = (plant_name_lower.encode('utf-8'),
+                       plant_name_lower.replace(' ', '').encode('utf-8'))
+
         for item in research_data:
+            # Budget spent: stop before marking anything that would not be used
+            if remaining is not None and remaining <= 0:
+                break
+
             if not isinstance(item, dict):
                 continue
 
@@ -194,6 +501,12 @@ class ExpandedArticleGenerator:
             if not content or len(content) < 30:
                 continue
 
+            # Must mention the plant name (or a close variant) early on; relevant
+            # articles name their subject up front, so only a bounded prefix is scanned
+            prefix_lower = content[:self.PLANT_NAME_PREFIX_CHARS].encode('utf-8', 'ignore').lower()
+            if not any(term in prefix_lower for term in plant_terms):
+                continue
+
             # Validate botanical relevance
             if not self.topic_validator.is_botanical_content(content, plant_name):
                 continue
@@ -201,72 +514,101 @@ class ExpandedArticleGenerator:
             # Generate content hash for deduplication
             content_hash = self._hash_content(content)
 
-            if content_hash in self.used_content_hashes or content_hash in local_used_hashes:
+            if self._is_duplicate(content_hash, local_used_hashes):
                 continue
 
-            content_lower = content.lower()
-            plant_name_lower = plant_name.lower()
-
-            # Must contain plant name or closely related terms
-            if not any(term in content_lower for term in [plant_name_lower, 
-                      plant_name_lower.replace(' ', '')]):
-                continue
-
-            relevant_content.append(content)
+            if remaining is None:
+                relevant_content.append(content)
+            else:
+                relevant_content.append(content[:remaining])
+                remaining -= len(relevant_content[-1]) + 1
             local_used_hashes.add(content_hash)
             self.used_content_hashes.add(content_hash)
+            if self._global_seen is not None:
+                self._global_seen.add(content_hash)
 
             if len(relevant_content) >= max_items:
                 break
 
-        return ' '.join(relevant_content)
+        self._persist_hashes(local_used_hashes)
+
+        joined = ' '.join(relevant_content)
+        return joined if max_chars is None else joined[:max_chars]
 
     def generate_expanded_section(self, content: str, plant_name: str, section_type: str) -> List[str]:
         """Generate 2-3 paragraphs for each section using AI or templates"""
-        
-        if not content and self.summarizer is None:
-            return self._generate_template_paragraphs(plant_name, section_type)
-        
-        paragraphs = []
-        
-        try:
-            if self.summarizer and content:
-                # Generate multiple focused summaries for different aspects
-                aspects = self._get_section_aspects(section_type)
-                
-                for aspect in aspects:
-                    # Create a clean, focused input without prompt language
-                    focused_content = f"{plant_name} {aspect}. {content[:400]}"
-                    
-                    summary = self.summarizer(
-                        focused_content,
-                        max_length=50,
-                        min_length=30,
-                        do_sample=True,
-                        temperature=0.7
-                    )
-                    
-                    if summary and len(summary) > 0:
-                        paragraph = self.content_cleaner.clean_content(summary[0]['summary_text'])
-                        
-                        # Ensure paragraph mentions the plant name
-                        if plant_name.lower() not in paragraph.lower() and paragraph:
-                            paragraph = f"{plant_name} {paragraph.lower()}"
-                        
-                        if paragraph and len(paragraph) > 30:
-                            paragraphs.append(paragraph)
-                    
-                    if len(paragraphs) >= 3:
-                        break
-            
-        except Exception as e:
-            logger.warning(f"Error in AI generation: {str(e)}")
-        
-        # Fallback to templates if AI generation failed or produced insufficient content
-        if len(paragraphs) < 2:
-            paragraphs = self._generate_template_paragraphs(plant_name, section_type)
-        
-        return paragraphs[:3]  # Limit to 3 paragraphs
+        return self.generate_expanded_sections([(content, section_type)], plant_name)[0]
+
+    def _prepare_inputs(self, content: str, plant_name: str, section_type: str) -> List[str]:
+        """Build one clean, focused summarizer input per aspect of a section"""
+        snippet = content[:self.SUMMARY_INPUT_CHARS]
+        return [f"{plant_name} {aspect}. {snippet}"
+                for aspect in self._get_section_aspects(section_type)]
+
+    def generate_expanded_sections(self, sections: List[Tuple[str, str]],
+                                   plant_name: str) -> List[List[str]]:
+        """Generate paragraphs for several (content, section_type) pairs at once.
+
+        The inputs of every section are sent to the summarizer in a single
+        batched call so the encoder-decoder setup is paid once per article.
+        """
+        # Too little source material for the model to work with - skip it entirely
+        batched = [i for i, (content, _) in enumerate(sections)
+                   if self.summarizer is not None and content and len(content) >= 50]
+
+        inputs: List[str] = []
+        spans: Dict[int, Tuple[int, int]] = {}
+        for i in batched:
+            content, section_type = sections[i]
+            start = len(inputs)
+            inputs.extend(self._prepare_inputs(content, plant_name, section_type))
+            spans[i] = (start, len(inputs))
+
+        summaries: list = []
+        if inputs:
+            try:
+                summaries = self.summarizer(
+                    inputs,
+                    max_length=50,
+                    min_length=30,
+                    do_sample=True,
+                    temperature=0.7,
+                    batch_size=len(inputs)
+                )
+            except Exception as e:
+                logger.warning(f"Error in AI generation: {str(e)}")
+                summaries = []
+
+        plant_name_lower = plant_name.lower()
+        results = []
+        for i, (_, section_type) in enumerate(sections):
+            paragraphs = []
+            start, end = spans.get(i, (0, 0))
+            for summary in summaries[start:end]:
+                # Pipelines return a single dict per input when batched
+                if isinstance(summary, list):
+                    summary = summary[0] if summary else None
+                if not summary:
+                    continue
+                paragraph = self.content_cleaner.clean_content(summary['summary_text'])
+
+                # Ensure paragraph mentions the plant name
+                if paragraph and plant_name_lower not in paragraph.lower():
+                    paragraph = f"{plant_name} {paragraph.lower()}"
+
+                if paragraph and len(paragraph) > 30:
+                    paragraphs.append(paragraph)
+
+                if len(paragraphs) >= 3:
+                    break
+
+            # Fallback to templates if AI generation failed or produced insufficient content
+            if len(paragraphs) < 2:
+                paragraphs = self._generate_template_paragraphs(plant_name, section_type)
+
+            results.append(paragraphs[:3])  # Limit to 3 paragraphs
+
+        return results
 
     def _get_section_aspects(self, section_type: str) -> List[str]:
         """Get different aspects to focus on for each section type"""
@@ -296,57 +638,18 @@ class ExpandedArticleGenerator:
 
     def _generate_template_paragraphs(self, plant_name: str, section_type: str) -> List[str]:
         """Generate 2-3 template-based paragraphs for each section"""
-        
-        templates = {
-            'introduction': [
-                f"{plant_name} represents one of South Africa's most distinctive indigenous plant species. This remarkable succulent has evolved unique characteristics that allow it to thrive in the challenging conditions of the country's arid regions. Its specialized adaptations showcase the incredible diversity of South African flora.",
-                f"Endemic to specific regions of South Africa, {plant_name} has captured the attention of botanists and plant enthusiasts worldwide. The species demonstrates remarkable resilience and has developed fascinating survival strategies over millennia of evolution.",
-                f"As part of South Africa's rich botanical heritage, {plant_name} contributes to the country's status as one of the world's most biodiverse nations. Its unique characteristics make it a subject of ongoing scientific study and conservation interest."
-            ],
-            'characteristics': [
-                f"{plant_name} exhibits distinctive morphological features that set it apart from other succulent species. Its compact, button-like form represents a highly specialized adaptation to extreme environmental conditions, with thick, fleshy leaves that efficiently store water during prolonged dry periods.",
-                f"The plant's unique structure includes specialized tissues that can expand and contract based on water availability. During favorable conditions, the leaves become plump and rounded, while in drought periods they may appear more wrinkled and withdrawn, demonstrating remarkable physiological flexibility.",
-                f"Color variations in {plant_name} range from subtle green tones to more vibrant hues, often influenced by environmental factors such as light exposure and seasonal changes. The plant's surface texture and patterns create intricate geometric designs that serve both functional and aesthetic purposes in nature."
-            ],
-            'habitat': [
-                f"{plant_name} inhabits the specialized ecosystems of South Africa's arid interior regions. These environments are characterized by extreme temperature fluctuations, minimal rainfall, and intense solar radiation, conditions that have shaped the plant's remarkable adaptations over thousands of years.",
-                f"The natural habitat of {plant_name} typically features rocky outcrops, quartzite substrates, and well-draining mineral soils. These geological formations provide the perfect combination of drainage, protection, and mineral nutrients that the species requires for optimal growth and reproduction.",
-                f"Seasonal patterns in the plant's native range include brief but intense rainfall periods followed by extended dry seasons. {plant_name} has evolved to maximize water uptake during these short favorable periods while maintaining metabolic functions throughout the challenging dry months."
-            ],
-            'cultural': [
-                f"{plant_name} holds special significance in South Africa's botanical and cultural landscape. Indigenous communities have long recognized the unique properties of this remarkable plant, incorporating knowledge of its characteristics into traditional ecological wisdom passed down through generations.",
-                f"The species serves as an important indicator of ecosystem health in its native habitat. Local conservation efforts increasingly recognize {plant_name} as a flagship species for protecting the unique biodiversity of South Africa's succulent regions.",
-                f"Modern horticultural interest in {plant_name} has led to its cultivation by specialized growers worldwide. This attention helps raise awareness of South Africa's remarkable succulent diversity and supports conservation initiatives in the plant's natural habitat."
-            ],
-            'conservation': [
-                f"{plant_name} faces various conservation challenges typical of South Africa's specialized succulent flora. Habitat degradation, climate change impacts, and collection pressures contribute to concerns about the long-term survival of wild populations.",
-                f"Protection efforts for {plant_name} focus on habitat preservation and sustainable management of natural populations. These initiatives involve collaboration between conservation organizations, research institutions, and local communities to ensure effective protection strategies.",
-                f"The species benefits from inclusion in specialized botanical collections and research programs that study South African succulents. These ex-situ conservation efforts complement habitat protection and contribute valuable scientific knowledge about the plant's biology and ecology."
-            ]
-        }
-        
-        return templates.get(section_type, templates['introduction'])
+        templates = _TEMPLATES.get(section_type, _TEMPLATES['introduction'])
+        return [template.format(p=plant_name) for template in templates]
 
-    def generate_jekyll_front_matter(self, plant_name: str, title: str) -> str:
-        """Generate Jekyll front matter for the article."""
-        slug = re.sub(r'[^a-z0-9]+', '-', plant_name.lower()).strip('-')
-        current_date = datetime.now().strftime('%Y-%m-%d')
+    def generate_jekyll_front_matter(self, plant_name: str, title: str,
+                                     date: Optional[str] = None) -> str:
+        """Generate Jekyll front matter for the article.
 
-        front_matter = f"""---
-layout: post
-title: "{title}"
-date: {current_date}
-categories: [south-african-plants, botanical-guide]
-tags: [flora, indigenous, conservation, ecology]
-plant_name: "{plant_name}"
-slug: "{slug}"
-featured_image: "/assets/images/plants/{slug}.jpg"
-description: "Explore {plant_name}, a remarkable South African plant species with unique adaptations and ecological significance."
-author: "Botanical Research Team"
----
-
-"""
-        return front_matter
+        Pass date (YYYY-MM-DD) to reuse a date already computed for the
+        article or batch; otherwise today's date is used.
+        """
+        current_date = date or datetime.now().strftime('%Y-%m-%d')
+        return _build_front_matter(plant_name, title, current_date)
 
     def generate_focused_article(self, research_data: List[Dict], plant_name: str, 
                                include_front_matter: bool = True) -> str:
@@ -361,64 +664,60 @@ author: "Botanical Research Team"
         self.used_content_hashes = set()
 
         # Generate title
-        title_templates = [
-            f"{plant_name}: A Remarkable South African Plant Species",
-            f"Discovering {plant_name}: Botanical Treasures of South Africa",
-            f"{plant_name}: Unique Adaptations in South African Flora",
-            f"The Fascinating World of {plant_name}: South African Botanical Heritage"
-        ]
-        selected_title = random.choice(title_templates)
+        selected_title = random.choice(_TITLE_TEMPLATES).format(p=plant_name)
+
+        # Build the article directly into a single buffer
+        buf = io.StringIO()
 
-        # Build sections with expanded content
-        html_sections = []
+        if include_front_matter:
+            buf.write(self.generate_jekyll_front_matter(plant_name, selected_title))
+            buf.write('\n')
+        body_start = buf.tell()
+
+        def _emit(heading: Optional[str], cls_name: str, paragraphs: List[str]) -> None:
+            """Write an optional section heading followed by its paragraphs."""
+            if buf.tell() > body_start:
+                buf.write('\n\n')
+            if heading:
+                buf.write(f'<h2 class="section-heading">{heading}</h2>\n\n')
+            buf.write('\n\n'.join(f'<p class="{cls_name}">{p}</p>' for p in paragraphs))
+
+        # Gather the source material for every section first so the
+        # summarizer can process all of them in one batch
+        intro_content = self.extract_relevant_content(research_data, plant_name, 'general', max_items=2,
+                                                      max_chars=self.SUMMARY_INPUT_CHARS)
+        char_content = self.extract_relevant_content(research_data, plant_name, 'characteristics', max_items=3,
+                                                     max_chars=self.SUMMARY_INPUT_CHARS)
+        habitat_content = self.extract_relevant_content(research_data, plant_name, 'habitat', max_items=3,
+                                                        max_chars=self.SUMMARY_INPUT_CHARS)
+        cultural_content = self.extract_relevant_content(research_data, plant_name, 'cultural', max_items=3,
+                                                         max_chars=self.SUMMARY_INPUT_CHARS)
+
+        (intro_paragraphs, char_paragraphs, habitat_paragraphs,
+         cultural_paragraphs, conservation_paragraphs) = self.generate_expanded_sections([
+            (intro_content, 'introduction'),
+            (char_content, 'characteristics'),
+            (habitat_content, 'habitat'),
+            (cultural_content, 'cultural'),
+            ('', 'conservation'),
+        ], plant_name)
 
         # Introduction - 2-3 paragraphs
-        intro_content = self.extract_relevant_content(research_data, plant_name, 'general', max_items=2)
-        intro_paragraphs = self.generate_expanded_section(intro_content, plant_name, 'introduction')
-        
-        for paragraph in intro_paragraphs:
-            html_sections.append(f'<p class="intro-paragraph">{paragraph}</p>')
+        _emit(None, 'intro-paragraph', intro_paragraphs)
 
         # Physical Characteristics - 2-3 paragraphs
-        char_content = self.extract_relevant_content(research_data, plant_name, 'characteristics', max_items=3)
-        char_paragraphs = self.generate_expanded_section(char_content, plant_name, 'characteristics')
-        
-        html_sections.append('<h2 class="section-heading">Physical Characteristics</h2>')
-        for paragraph in char_paragraphs:
-            html_sections.append(f'<p class="characteristics-paragraph">{paragraph}</p>')
+        _emit('Physical Characteristics', 'characteristics-paragraph', char_paragraphs)
 
         # Natural Habitat - 2-3 paragraphs
-        habitat_content = self.extract_relevant_content(research_data, plant_name, 'habitat', max_items=3)
-        habitat_paragraphs = self.generate_expanded_section(habitat_content, plant_name, 'habitat')
-        
-        html_sections.append('<h2 class="section-heading">Natural Habitat</h2>')
-        for paragraph in habitat_paragraphs:
-            html_sections.append(f'<p class="habitat-paragraph">{paragraph}</p>')
+        _emit('Natural Habitat', 'habitat-paragraph', habitat_paragraphs)
 
         # Cultural Significance - 2-3 paragraphs
-        cultural_content = self.extract_relevant_content(research_data, plant_name, 'cultural', max_items=3)
-        cultural_paragraphs = self.generate_expanded_section(cultural_content, plant_name, 'cultural')
-        
-        html_sections.append('<h2 class="section-heading">Ecological and Cultural Significance</h2>')
-        for paragraph in cultural_paragraphs:
-            html_sections.append(f'<p class="cultural-paragraph">{paragraph}</p>')
+        _emit('Ecological and Cultural Significance', 'cultural-paragraph', cultural_paragraphs)
 
         # Conservation - 2-3 paragraphs
-        conservation_paragraphs = self.generate_expanded_section('', plant_name, 'conservation')
-        
-        html_sections.append('<h2 class="section-heading">Conservation Status</h2>')
-        for paragraph in conservation_paragraphs:
-            html_sections.append(f'<p class="conservation-paragraph">{paragraph}</p>')
+        _emit('Conservation Status', 'conservation-paragraph', conservation_paragraphs)
 
-        # Compile final article
-        article_parts = []
-
-        if include_front_matter:
-            article_parts.append(self.generate_jekyll_front_matter(plant_name, selected_title))
-
-        article_parts.append('\n\n'.join(html_sections))
-
-        final_article = '\n'.join(article_parts)
+        final_article = buf.getvalue()
 
         logger.info(f"Expanded article generated successfully for {plant_name}")
         return final_article
@@ -432,22 +731,25 @@ author: "Botanical Research Team"
 ArticleGenerator = ExpandedArticleGenerator
 
 # Convenience functions for backward compatibility
+def _get_default_generator() -> ExpandedArticleGenerator:
+    """Build a generator for one call of the module-level convenience functions.
+
+    Generators hold per-article dedup state, so concurrent requests each get
+    their own; the expensive part, the summarization pipeline, is shared
+    through _SUMMARIZERS.
+    """
+    return ExpandedArticleGenerator()
+
 def generate_article(research_data: List[Dict], plant_name: str) -> str:
     """Generate article using default settings (backward compatibility)."""
-    generator = ArticleGenerator()
+    generator = _get_default_generator()
     return generator.generate_focused_article(research_data, plant_name, include_front_matter=False)
 
 def generate_plant_title(plant_name: str) -> str:
     """Generate an engaging title for the plant article (backward compatibility)."""
-    title_templates = [
-        f"{plant_name}: A Remarkable South African Plant Species",
-        f"Discovering {plant_name}: Botanical Treasures of South Africa", 
-        f"{plant_name}: Unique Adaptations in South African Flora",
-        f"The Fascinating World of {plant_name}: South African Botanical Heritage"
-    ]
-    return random.choice(title_templates)
+    return random.choice(_TITLE_TEMPLATES).format(p=plant_name)
 
 def generate_focused_article(research_data: List[Dict], plant_name: str) -> str:
     """Generate a focused article using the improved generator."""
-    generator = ExpandedArticleGenerator()
+    generator = _get_default_generator()
     return generator.generate_focused_article(research_data, plant_name, include_front_matter=False)
\ No newline at end of file
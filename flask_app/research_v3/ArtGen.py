@@ -4,31 +4,392 @@ Enhanced Article Generator with 5-Section Structure using RAG System
 Sections: Introduction, Facts, Care, Benefits, and Conclusion
 """
 import os
+import json
+import hashlib
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: only needed for the semantic answer cache
+    np = None
+
+
+# Characters mapped to hyphens when a plant name becomes a Jekyll tag
+_TAG_TRANS = str.maketrans({" ": "-", "_": "-"})
+
+
+def _plant_tag(plant_name: str) -> str:
+    """Jekyll tag for a plant name"""
+    return plant_name.lower().translate(_TAG_TRANS)
+
+# Keywords that mark a research item as useful for each fallback section
+_FACT_KEYWORDS = ('native', 'species', 'family', 'discovered', 'named')
+_CARE_KEYWORDS = ('water', 'soil', 'sun', 'light', 'grow', 'plant', 'care', 'propagat')
+_BENEFIT_KEYWORDS = ('medicin', 'tradition', 'use', 'benefit', 'treat', 'heal', 'cultur')
+
+
+@lru_cache(maxsize=4096)
+def _plant_slug(plant_name: str) -> str:
+    """URL slug used for a plant's header image file name"""
+    return plant_name.lower().replace(' ', '-')
+
+
+@lru_cache(maxsize=4096)
+def _image_exists(path: str) -> bool:
+    """Cached os.path.isfile; images added while the process runs are not seen"""
+    return os.path.isfile(path)
+
+
+class SemanticAnswerCache:
+    """
+    Approximate cache of RAG answers keyed on query embeddings
+
+    A query whose embedding has cosine similarity >= threshold with a cached
+    query issued under the same key reuses that answer. Least recently used
+    entries are evicted beyond capacity. The cache is not thread-safe and
+    not saved automatically; callers lock around it and call save().
+    """
+
+    def __init__(self, encode, threshold: float = 0.97, capacity: int = 1024,
+                 path: Optional[str] = None):
+        """
+        Args:
+            encode: Callable mapping a list of strings to an embedding matrix
+                (e.g. the RAG system's SentenceTransformer.encode)
+            threshold: Minimum cosine similarity for a cache hit
+            capacity: Maximum number of cached answers
+            path: Optional .npz file the cache is loaded from and saved to
+        """
+        self.encode = encode
+        self.threshold = threshold
+        self.capacity = capacity
+        self.path = path
+        self._keys: List[str] = []
+        self._vectors: List = []
+        self._answers: List[str] = []
+        self._matrix = None
+        self.dirty = False
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def embed(self, query: str):
+        """Embed and L2-normalize a query so a dot product is its cosine similarity"""
+        vector = np.asarray(self.encode([query]), dtype='float32')[0]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, vector, key: str) -> Optional[str]:
+        """Find a cached answer for a query embedding (see embed()) under key"""
+        if not self._vectors:
+            return None
+
+        if self._matrix is None:
+            self._matrix = np.vstack(self._vectors)
+        similarities = self._matrix @ vector
+
+        # Only entries above the threshold are compared in Python, best first
+        candidates = np.flatnonzero(similarities >= self.threshold)[::-1]
+        best = next((int(i) for i in candidates[np.argsort(-similarities[candidates], kind='stable')]
+                     if self._keys[i] == key), None)
+        if best is None:
+            return None
+
+        # Move the hit to the most recently used end
+        answer = self._answers[best]
+        self._append(self._keys.pop(best), self._vectors.pop(best), self._answers.pop(best))
+        return answer
+
+    def add(self, vector, key: str, answer: str):
+        """Cache an answer under its query embedding, evicting the oldest entry if full"""
+        while len(self._answers) >= self.capacity:
+            self._keys.pop(0)
+            self._vectors.pop(0)
+            self._answers.pop(0)
+        self._append(key, vector, answer)
+        self.dirty = True
+
+    def _append(self, key: str, vector, answer: str):
+        self._keys.append(key)
+        self._vectors.append(vector)
+        self._answers.append(answer)
+        self._matrix = None
+
+    def save(self):
+        """Write the cache to its .npz file if it changed since the last save"""
+        if not (self.path and self.dirty):
+            return
+        with open(self.path, 'wb') as f:
+            np.savez(f, keys=np.array(self._keys, dtype=str),
+                     vectors=np.vstack(self._vectors) if self._vectors else np.empty((0, 0), dtype='float32'),
+                     answers=np.array(self._answers, dtype=str))
+        self.dirty = False
+
+    def load(self):
+        """Read the cache back from its .npz file"""
+        with np.load(self.path) as data:
+            self._keys = [str(key) for key in data['keys']]
+            self._vectors = list(data['vectors'])
+            self._answers = [str(answer) for answer in data['answers']]
+        self._matrix = None
+        self.dirty = False
+
+    def clear(self):
+        """Drop every cached answer"""
+        self._keys, self._vectors, self._answers = [], [], []
+        self._matrix = None
+        self.dirty = True
+
 
 class EnhancedPlantArticleGenerator:
     """
     Generates structured plant articles with 5 sections using RAG system
     """
 
-    def __init__(self, rag_system=None):
+    # Jekyll front matter and header image, filled in per article
+    FRONT_MATTER_TEMPLATE = """---
+layout: post
+title: "The Complete Guide to {plant_name}"
+subtitle: "Discover the facts, care tips, and benefits of this remarkable South African plant"
+date: {date}
+background: '/img/posts/{background:02d}.jpg'
+categories: [South African Plants, Botany, Plant Care]
+tags: [{tag}, indigenous-plants, south-african-flora, plant-guide]
+---
+
+"""
+    IMAGE_TEMPLATE = '''<img class="img-fluid" src="/img/plants/{slug}.jpg"
+             alt="{plant_name}" onerror="this.src='/img/posts/default-plant.jpg'">
+<span class="caption text-muted">{plant_name} in its natural habitat</span>
+
+'''
+    # Used instead when image_dir lets the image be resolved at generation time
+    RESOLVED_IMAGE_TEMPLATE = '''<img class="img-fluid" src="{src}" alt="{plant_name}">
+<span class="caption text-muted">{plant_name} in its natural habitat</span>
+
+'''
+    DEFAULT_IMAGE = '/img/posts/default-plant.jpg'
+
+    # RAG query template and settings for each section
+    SECTION_QUERIES = {
+        'introduction': ("Write an engaging introduction about {plant_name}, including its origin and significance",
+                         {'k': 3, 'max_new_tokens': 300, 'temperature': 0.7}),
+        'facts': ("What are the most interesting botanical facts about {plant_name}?",
+                  {'k': 5, 'max_new_tokens': 400, 'temperature': 0.7}),
+        'care': ("How do you care for and cultivate {plant_name}? Include watering, light, soil, and propagation.",
+                 {'k': 5, 'max_new_tokens': 500, 'temperature': 0.6}),
+        'benefits': ("What are the medicinal, ecological, and cultural benefits of {plant_name}?",
+                     {'k': 5, 'max_new_tokens': 400, 'temperature': 0.7}),
+        'conclusion': ("Summarize the key points about {plant_name} including its importance, care needs, and value",
+                       {'k': 5, 'max_new_tokens': 350, 'temperature': 0.6}),
+    }
+
+    def __init__(self, rag_system=None, cache_threshold: Optional[float] = None,
+                 cache_capacity: int = 1024, cache_path: Optional[str] = None,
+                 exact_cache: bool = False, exact_cache_path: Optional[str] = None,
+                 image_dir: Optional[str] = None):
         """
         Initialize the generator with optional RAG system
 
         Args:
             rag_system: Instance of RAGSystem for AI-powered content generation
+            cache_threshold: Enables the semantic answer cache; a query whose
+                embedding is at least this cosine-similar to a cached one
+                (e.g. 0.97) reuses its answer instead of running the LLM
+            cache_capacity: Maximum number of cached answers
+            cache_path: Optional .npz file that persists the cache
+            exact_cache: Reuse the answer of an identical (case-insensitive)
+                query and generation settings without embedding it
+            exact_cache_path: Optional JSON file that persists the exact cache
+            image_dir: Local directory served as /img/plants; when given, the
+                header image is checked here and the default image is linked
+                directly instead of relying on a client-side onerror fallback
         """
         self.rag_system = rag_system
+        self.image_dir = image_dir
+        # Guards the answer caches when articles are generated concurrently
+        self._cache_lock = threading.RLock()
+        self.exact_cache: Optional[Dict[str, str]] = {} if exact_cache or exact_cache_path else None
+        self.exact_cache_path = exact_cache_path
+        self._exact_cache_dirty = False
+        if exact_cache_path and os.path.exists(exact_cache_path):
+            with open(exact_cache_path, 'r', encoding='utf-8') as f:
+                self.exact_cache = json.load(f)
+        self.answer_cache = None
+        if (cache_threshold is not None and np is not None
+                and hasattr(rag_system, 'embedding_model')):
+            self.answer_cache = SemanticAnswerCache(
+                rag_system.embedding_model.encode, threshold=cache_threshold,
+                capacity=cache_capacity, path=cache_path)
+
+    @staticmethod
+    def _cache_keys(section: str, plant_name: str, params: Dict[str, Any],
+                    context: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Keys of a section answer in the exact and the semantic cache
+
+        The exact tier (hashed together with the query) matches the same
+        settings and shared context. The semantic tier is keyed on plant and
+        section only: it reuses an answer for the same section of the same
+        plant when the query is paraphrased or the context changed, but never
+        across plants (section queries differ only in the plant name) or
+        sections (facts and benefits share their settings).
+        """
+        digest = hashlib.sha1(context.encode('utf-8')).hexdigest() if context is not None else None
+        exact_key = json.dumps({'context': digest, 'params': params}, sort_keys=True)
+        semantic_key = json.dumps({'plant': plant_name.lower(), 'section': section}, sort_keys=True)
+        return exact_key, semantic_key
+
+    def _lookup_answer(self, query: str, key: str,
+                       semantic_key: str) -> Tuple[Optional[str], Optional[str], Any]:
+        """
+        Look a query up in the answer caches (keys from _cache_keys)
+
+        Returns:
+            (cached answer or None, exact-cache key, query embedding), the last
+            two to be handed to _store_answer() on a miss
+        """
+        # Exact tier: identical query and key, no embedding needed
+        exact_key = None
+        if self.exact_cache is not None:
+            exact_key = hashlib.sha1(f"{query.lower()}|{key}".encode('utf-8')).hexdigest()
+            with self._cache_lock:
+                answer = self.exact_cache.get(exact_key)
+            if answer is not None:
+                return answer, exact_key, None
+
+        # Semantic tier: a sufficiently similar earlier query. The embedding
+        # model runs outside the lock so concurrent articles don't queue on it
+        if self.answer_cache is None:
+            return None, exact_key, None
+        vector = self.answer_cache.embed(query)
+        with self._cache_lock:
+            answer = self.answer_cache.lookup(vector, semantic_key)
+            if answer is not None:
+                self._store_exact(exact_key, answer)
+        return answer, exact_key, vector
+
+    def _store_answer(self, semantic_key: str, answer: str, exact_key: Optional[str], vector):
+        """Cache a freshly generated answer in every enabled tier"""
+        # Generation failures come back as text; don't serve them again
+        if answer.startswith('Error generating answer:'):
+            return
+        with self._cache_lock:
+            if self.answer_cache is not None:
+                self.answer_cache.add(vector, semantic_key, answer)
+            self._store_exact(exact_key, answer)
+
+    def _store_exact(self, exact_key: Optional[str], answer: str):
+        if exact_key is None:
+            return
+        self.exact_cache[exact_key] = answer
+        self._exact_cache_dirty = True
+
+    def save_caches(self):
+        """Write the persistent answer caches that changed since the last save"""
+        with self._cache_lock:
+            if self.answer_cache is not None:
+                self.answer_cache.save()
+            if self.exact_cache_path and self._exact_cache_dirty:
+                with open(self.exact_cache_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.exact_cache, f)
+                self._exact_cache_dirty = False
+
+    def _rag_answer(self, section: str, plant_name: str, context: Optional[str] = None,
+                    prefetched: Optional[Dict[str, str]] = None) -> str:
+        """
+        Answer a section's query with the RAG system, going through the answer
+        caches if enabled
+
+        When context is given (see retrieve_shared_context) the LLM answers from
+        it directly instead of running its own retrieval; k is then unused.
+        prefetched holds answers from prefetch_section_answers, keyed on query.
+        """
+        template, params = self.SECTION_QUERIES[section]
+        query = template.format(plant_name=plant_name)
+        if prefetched and query in prefetched:
+            return prefetched[query]
+
+        key, semantic_key = self._cache_keys(section, plant_name, params, context)
+        answer, exact_key, vector = self._lookup_answer(query, key, semantic_key)
+        if answer is not None:
+            return answer
+
+        if context is not None:
+            generation = {name: value for name, value in params.items() if name != 'k'}
+            answer = self.rag_system.generate(query, context, **generation)
+        else:
+            answer = self.rag_system.query(query, **params)['answer']
+        self._store_answer(semantic_key, answer, exact_key, vector)
+        return answer
+
+    def prefetch_section_answers(self, plant_name: str, context: str) -> Dict[str, str]:
+        """
+        Generate every section's answer from one shared context in batched LLM calls
+
+        Uncached queries with the same temperature go to the LLM as one batch,
+        generated up to the largest max_new_tokens among them.
+
+        Returns:
+            Answers keyed on query, to pass to the section methods as
+            prefetched; kept per call so concurrent articles never share them
+        """
+        pending: Dict[float, List[tuple]] = {}
+        prefetched: Dict[str, str] = {}
+        for section, (template, params) in self.SECTION_QUERIES.items():
+            query = template.format(plant_name=plant_name)
+            key, semantic_key = self._cache_keys(section, plant_name, params, context)
+            answer, exact_key, vector = self._lookup_answer(query, key, semantic_key)
+            if answer is not None:
+                prefetched[query] = answer
+            else:
+                pending.setdefault(params['temperature'], []).append(
+                    (query, semantic_key, params, exact_key, vector))
+
+        for temperature, items in pending.items():
+            answers = self.rag_system.generate_batch(
+                [item[0] for item in items], context,
+                max_new_tokens=max(item[2]['max_new_tokens'] for item in items),
+                temperature=temperature)
+            for (query, semantic_key, _, exact_key, vector), answer in zip(items, answers):
+                self._store_answer(semantic_key, answer, exact_key, vector)
+                prefetched[query] = answer
+
+        return prefetched
+
+    def retrieve_shared_context(self, plant_name: str, k: int = 15) -> Optional[str]:
+        """
+        Retrieve context once for all five sections
 
-    def generate_introduction(self, plant_name: str, research_data: List[Dict]) -> str:
+        Returns None when the RAG system cannot generate from a prebuilt
+        context, in which case each section runs its own retrieval.
+        """
+        if not (hasattr(self.rag_system, 'retrieve') and hasattr(self.rag_system, 'generate')):
+            return None
+        query = (f"{plant_name} introduction, origin and significance, botanical facts, "
+                 f"care and cultivation, medicinal, ecological and cultural benefits")
+        retrieved_docs = self.rag_system.retrieve(query, k=k)
+        return self.rag_system.generate_context(retrieved_docs)
+
+    @staticmethod
+    def _iter_research(research_data: List[Dict]):
+        """Yield (stripped content, lowercased content) for each research item"""
+        for item in research_data:
+            content = item.get('content', '').strip()
+            yield content, content.lower()
+
+    def generate_introduction(self, plant_name: str, research_data: List[Dict],
+                              context: Optional[str] = None,
+                              prefetched: Optional[Dict[str, str]] = None) -> str:
         """Generate engaging introduction section"""
         if self.rag_system and research_data:
             # Use RAG to generate introduction
-            query = f"Write an engaging introduction about {plant_name}, including its origin and significance"
-            result = self.rag_system.query(query, k=3, max_new_tokens=300, temperature=0.7)
-            intro = result['answer']
+            intro = self._rag_answer('introduction', plant_name, context, prefetched)
         else:
             # Fallback introduction
             intro = f"""Welcome to our comprehensive guide on {plant_name}, one of South Africa's most
@@ -40,23 +401,26 @@ class EnhancedPlantArticleGenerator:
         return f"""<h2 class="section-heading">Introduction</h2>
 <p>{intro}</p>"""
 
-    def generate_facts_section(self, plant_name: str, research_data: List[Dict]) -> str:
+    def generate_facts_section(self, plant_name: str, research_data: List[Dict],
+                               context: Optional[str] = None,
+                               research: Optional[List[Tuple[str, str]]] = None,
+                               prefetched: Optional[Dict[str, str]] = None) -> str:
         """Generate interesting facts section"""
         facts_html = ['<h2 class="section-heading">Fascinating Facts</h2>']
 
         if self.rag_system and research_data:
             # Use RAG to generate facts
-            query = f"What are the most interesting botanical facts about {plant_name}?"
-            result = self.rag_system.query(query, k=5, max_new_tokens=400, temperature=0.7)
-            facts_content = result['answer']
+            facts_content = self._rag_answer('facts', plant_name, context, prefetched)
             facts_html.append(f'<p>{facts_content}</p>')
         else:
             # Extract facts from research data
             fact_items = []
-            for item in research_data:
-                content = item.get('content', '').strip()
-                if len(content) > 100 and any(keyword in content.lower()
-                    for keyword in ['native', 'species', 'family', 'discovered', 'named']):
+            if research is None:
+                research = self._iter_research(research_data)
+            for content, content_lower in research:
+                if len(content) <= 100:
+                    continue
+                if any(keyword in content_lower for keyword in _FACT_KEYWORDS):
                     fact_items.append(content[:250] + '...' if len(content) > 250 else content)
                     if len(fact_items) >= 3:
                         break
@@ -81,23 +445,24 @@ class EnhancedPlantArticleGenerator:
 
         return '\n'.join(facts_html)
 
-    def generate_care_section(self, plant_name: str, research_data: List[Dict]) -> str:
+    def generate_care_section(self, plant_name: str, research_data: List[Dict],
+                              context: Optional[str] = None,
+                              research: Optional[List[Tuple[str, str]]] = None,
+                              prefetched: Optional[Dict[str, str]] = None) -> str:
         """Generate plant care and cultivation section"""
         care_html = ['<h2 class="section-heading">Care & Cultivation</h2>']
 
         if self.rag_system and research_data:
             # Use RAG for care instructions
-            query = f"How do you care for and cultivate {plant_name}? Include watering, light, soil, and propagation."
-            result = self.rag_system.query(query, k=5, max_new_tokens=500, temperature=0.6)
-            care_content = result['answer']
+            care_content = self._rag_answer('care', plant_name, context, prefetched)
             care_html.append(f'<p>{care_content}</p>')
         else:
             # Extract care info from research
             care_info = []
-            for item in research_data:
-                content = item.get('content', '').strip()
-                if any(keyword in content.lower() for keyword in
-                    ['water', 'soil', 'sun', 'light', 'grow', 'plant', 'care', 'propagat']):
+            if research is None:
+                research = self._iter_research(research_data)
+            for content, content_lower in research:
+                if any(keyword in content_lower for keyword in _CARE_KEYWORDS):
                     care_info.append(content[:300] + '...' if len(content) > 300 else content)
                     if len(care_info) >= 2:
                         break
@@ -128,23 +493,24 @@ class EnhancedPlantArticleGenerator:
 
         return '\n'.join(care_html)
 
-    def generate_benefits_section(self, plant_name: str, research_data: List[Dict]) -> str:
+    def generate_benefits_section(self, plant_name: str, research_data: List[Dict],
+                                  context: Optional[str] = None,
+                                  research: Optional[List[Tuple[str, str]]] = None,
+                                  prefetched: Optional[Dict[str, str]] = None) -> str:
         """Generate benefits and uses section"""
         benefits_html = ['<h2 class="section-heading">Benefits & Traditional Uses</h2>']
 
         if self.rag_system and research_data:
             # Use RAG for benefits
-            query = f"What are the medicinal, ecological, and cultural benefits of {plant_name}?"
-            result = self.rag_system.query(query, k=5, max_new_tokens=400, temperature=0.7)
-            benefits_content = result['answer']
+            benefits_content = self._rag_answer('benefits', plant_name, context, prefetched)
             benefits_html.append(f'<p>{benefits_content}</p>')
         else:
             # Extract benefits from research
             benefits_info = []
-            for item in research_data:
-                content = item.get('content', '').strip()
-                if any(keyword in content.lower() for keyword in
-                    ['medicin', 'tradition', 'use', 'benefit', 'treat', 'heal', 'cultur']):
+            if research is None:
+                research = self._iter_research(research_data)
+            for content, content_lower in research:
+                if any(keyword in content_lower for keyword in _BENEFIT_KEYWORDS):
                     benefits_info.append(content[:300] + '...' if len(content) > 300 else content)
                     if len(benefits_info) >= 2:
                         break
@@ -173,15 +539,15 @@ class EnhancedPlantArticleGenerator:
 
         return '\n'.join(benefits_html)
 
-    def generate_conclusion(self, plant_name: str, research_data: List[Dict]) -> str:
+    def generate_conclusion(self, plant_name: str, research_data: List[Dict],
+                            context: Optional[str] = None,
+                            prefetched: Optional[Dict[str, str]] = None) -> str:
         """Generate conclusion/summary section using HF model"""
         conclusion_html = ['<h2 class="section-heading">Conclusion</h2>']
 
         if self.rag_system and research_data:
             # Use RAG to generate comprehensive summary
-            query = f"Summarize the key points about {plant_name} including its importance, care needs, and value"
-            result = self.rag_system.query(query, k=5, max_new_tokens=350, temperature=0.6)
-            conclusion = result['answer']
+            conclusion = self._rag_answer('conclusion', plant_name, context, prefetched)
             conclusion_html.append(f'<p>{conclusion}</p>')
         else:
             # Fallback conclusion
@@ -199,8 +565,26 @@ class EnhancedPlantArticleGenerator:
 
         return '\n'.join(conclusion_html)
 
+    def generate_image_section(self, plant_name: str) -> str:
+        """
+        Generate the header image block
+
+        Without image_dir the browser falls back to the default image;
+        with it, the existence check runs once per file at generation time.
+        """
+        slug = _plant_slug(plant_name)
+        if self.image_dir is None:
+            return self.IMAGE_TEMPLATE.format(plant_name=plant_name, slug=slug)
+
+        if _image_exists(os.path.join(self.image_dir, f'{slug}.jpg')):
+            src = f'/img/plants/{slug}.jpg'
+        else:
+            src = self.DEFAULT_IMAGE
+        return self.RESOLVED_IMAGE_TEMPLATE.format(plant_name=plant_name, src=src)
+
     def generate_full_article(self, plant_name: str, research_data: List[Dict],
-                            include_front_matter: bool = True) -> str:
+                            include_front_matter: bool = True, date: Optional[datetime] = None,
+                            background: Optional[int] = None, persist_caches: bool = True) -> str:
         """
         Generate complete article with all 5 sections
 
@@ -208,50 +592,91 @@ class EnhancedPlantArticleGenerator:
             plant_name: Name of the plant
             research_data: List of research data dictionaries
             include_front_matter: Whether to include Jekyll front matter
+            date: Post date; defaults to now
+            background: Header image number (1-6); picked at random if omitted
+            persist_caches: Write the persistent answer caches once the article
+                is built; batch callers pass False and save once at the end
 
         Returns:
             Complete HTML article
         """
-        date = datetime.now()
+        if date is None:
+            date = datetime.now()
 
         # Generate Jekyll front matter
         if include_front_matter:
-            front_matter = f"""---
-layout: post
-title: "The Complete Guide to {plant_name}"
-subtitle: "Discover the facts, care tips, and benefits of this remarkable South African plant"
-date: {date.strftime('%Y-%m-%d %H:%M:%S')}
-background: '/img/posts/{random.randint(1, 6):02d}.jpg'
-categories: [South African Plants, Botany, Plant Care]
-tags: [{plant_name.lower()}, indigenous-plants, south-african-flora, plant-guide]
----
-
-"""
+            if background is None:
+                background = random.randint(1, 6)
+            front_matter = self.FRONT_MATTER_TEMPLATE.format(
+                plant_name=plant_name, date=date.strftime('%Y-%m-%d %H:%M:%S'),
+                background=background, tag=_plant_tag(plant_name))
         else:
             front_matter = ""
 
+        # One retrieval shared by every section
+        context = None
+        prefetched = None
+        research = None
+        if self.rag_system and research_data:
+            context = self.retrieve_shared_context(plant_name)
+            # ...and batched generation of all section answers from it
+            if context is not None and hasattr(self.rag_system, 'generate_batch'):
+                prefetched = self.prefetch_section_answers(plant_name, context)
+        else:
+            # The fallback sections all scan the research items; strip and lowercase them once
+            research = list(self._iter_research(research_data))
+
         # Generate all sections
         sections = [
-            self.generate_introduction(plant_name, research_data),
-            self.generate_facts_section(plant_name, research_data),
-            self.generate_care_section(plant_name, research_data),
-            self.generate_benefits_section(plant_name, research_data),
-            self.generate_conclusion(plant_name, research_data)
+            self.generate_introduction(plant_name, research_data, context, prefetched),
+            self.generate_facts_section(plant_name, research_data, context, research, prefetched),
+            self.generate_care_section(plant_name, research_data, context, research, prefetched),
+            self.generate_benefits_section(plant_name, research_data, context, research, prefetched),
+            self.generate_conclusion(plant_name, research_data, context, prefetched)
         ]
+        if persist_caches:
+            self.save_caches()
 
-        # Add image placeholder (optional)
-        image_section = f'''<img class="img-fluid" src="/img/plants/{plant_name.lower().replace(' ', '-')}.jpg"
-             alt="{plant_name}" onerror="this.src='/img/posts/default-plant.jpg'">
-<span class="caption text-muted">{plant_name} in its natural habitat</span>
-
-'''
+        image_section = self.generate_image_section(plant_name)
 
-        # Combine everything
+        # Combine everything in one join; chained + would copy the body twice
         article_body = '\n\n'.join(sections)
-        full_article = front_matter + image_section + article_body
+        full_article = ''.join((front_matter, image_section, article_body))
 
         return full_article
 
+    def generate_articles(self, plant_names: List[str], research_data: Dict[str, List[Dict]],
+                          include_front_matter: bool = True, max_workers: int = 4) -> List[str]:
+        """
+        Generate articles for several plants concurrently
+
+        Workers share this generator's RAG system and caches, so retrieval and
+        embedding for one plant overlap with LLM generation for another.
+
+        Args:
+            plant_names: Names of the plants
+            research_data: Research data per plant name
+            include_front_matter: Whether to include Jekyll front matter
+            max_workers: Number of articles generated at once
+
+        Returns:
+            Complete HTML articles, in the order of plant_names
+        """
+        # One post date and all header images drawn up front for the batch
+        date = datetime.now()
+        backgrounds = random.choices(range(1, 7), k=len(plant_names))
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(
+                    lambda plant_name, background: self.generate_full_article(
+                        plant_name, research_data.get(plant_name, []), include_front_matter,
+                        date=date, background=background, persist_caches=False),
+                    plant_names, backgrounds))
+        finally:
+            # One write for the whole batch instead of one per cached answer
+            self.save_caches()
+
 
 # Integration function for existing test_generator.py
 def create_enhanced_generator(rag_system=None):
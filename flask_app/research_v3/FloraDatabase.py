@@ -1,16 +1,101 @@
 
+import csv
+import itertools
 import sqlite3
-import pandas as pd
+import threading
 from typing import List, Dict, Optional
 
 class FloraDatabase:
+    # SQLite's default limit on bound parameters per statement
+    MAX_QUERY_PARAMS = 999
+
     def __init__(self, db_name: str = "flora_data.db"):
         """Initialize database connection."""
         self.db_name = db_name
+        # One long-lived connection per thread, opened lazily by _connect()
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening and tuning it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_name)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=-65536")
+            self._local.conn = conn
+        return conn
+
+    def migrate(self) -> bool:
+        """Bring the schema up to date: lookup indexes and the search index.
+
+        Run once after the flora_plants table is created or scraped into,
+        not on a read path. Returns whether the FTS search index is available.
+        """
+        self.create_indexes()
+        return self.create_search_index()
+
+    def create_indexes(self):
+        """Index the columns the lookup methods filter and sort on."""
+        self._connect().executescript("""
+            CREATE INDEX IF NOT EXISTS idx_sci ON flora_plants(scientific_name);
+            CREATE INDEX IF NOT EXISTS idx_title ON flora_plants(title);
+            CREATE INDEX IF NOT EXISTS idx_family_sci ON flora_plants(family, scientific_name);
+            CREATE INDEX IF NOT EXISTS idx_complete_sci ON flora_plants(complete, scientific_name);
+        """)
+
+    def create_search_index(self) -> bool:
+        """Build the trigram FTS5 index behind search_by_scientific_name.
+
+        A one-off migration that backfills every row, so run it explicitly
+        (e.g. after scraping) rather than on a read path; triggers then keep
+        it in sync with flora_plants. Returns False when FTS5 or the trigram
+        tokenizer is unavailable, in which case searches keep scanning.
+        """
+        conn = self._connect()
+        try:
+            if self._has_search_index(conn):
+                return True
+            conn.executescript("""
+                BEGIN;
+                CREATE VIRTUAL TABLE flora_fts USING fts5(scientific_name, tokenize='trigram');
+                INSERT INTO flora_fts(rowid, scientific_name)
+                    SELECT id, scientific_name FROM flora_plants;
+                CREATE TRIGGER IF NOT EXISTS flora_fts_insert AFTER INSERT ON flora_plants BEGIN
+                    INSERT OR REPLACE INTO flora_fts(rowid, scientific_name)
+                        VALUES (new.id, new.scientific_name);
+                END;
+                CREATE TRIGGER IF NOT EXISTS flora_fts_update AFTER UPDATE OF scientific_name ON flora_plants BEGIN
+                    UPDATE flora_fts SET scientific_name = new.scientific_name WHERE rowid = old.id;
+                END;
+                CREATE TRIGGER IF NOT EXISTS flora_fts_delete AFTER DELETE ON flora_plants BEGIN
+                    DELETE FROM flora_fts WHERE rowid = old.id;
+                END;
+                COMMIT;
+            """)
+            return True
+        except sqlite3.OperationalError:
+            if conn.in_transaction:
+                conn.rollback()
+            return False
+
+    @staticmethod
+    def _has_search_index(conn: sqlite3.Connection) -> bool:
+        """Whether the database schema has the FTS index, whoever built it."""
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'flora_fts'"
+        ).fetchone() is not None
+
+    def close(self):
+        """Close the calling thread's database connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
 
     def get_all_scientific_names(self) -> List[tuple]:
         """Get all scientific names from the database."""
-        conn = sqlite3.connect(self.db_name)
+        conn = self._connect()
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -21,13 +106,12 @@ class FloraDatabase:
         """)
 
         results = cursor.fetchall()
-        conn.close()
 
         return results
 
     def get_scientific_names_with_complete_data(self) -> List[tuple]:
         """Get scientific names only for complete entries."""
-        conn = sqlite3.connect(self.db_name)
+        conn = self._connect()
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -39,7 +123,6 @@ class FloraDatabase:
         """)
 
         results = cursor.fetchall()
-        conn.close()
 
         return results
 
@@ -51,7 +134,7 @@ class FloraDatabase:
             False if complete = 0
             None if scientific name not found
         """
-        conn = sqlite3.connect(self.db_name)
+        conn = self._connect()
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -61,7 +144,6 @@ class FloraDatabase:
         """, (scientific_name,))
 
         result = cursor.fetchone()
-        conn.close()
 
         if result is None:
             return None
@@ -74,7 +156,7 @@ class FloraDatabase:
         Returns:
             List of tuples: (id, title, scientific_name, family, genus, url)
         """
-        conn = sqlite3.connect(self.db_name)
+        conn = self._connect()
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -85,15 +167,31 @@ class FloraDatabase:
         """)
 
         results = cursor.fetchall()
-        conn.close()
 
         return results
 
     def search_by_scientific_name(self, search_term: str) -> List[tuple]:
         """Search for plants by scientific name (partial match)."""
-        conn = sqlite3.connect(self.db_name)
+        conn = self._connect()
         cursor = conn.cursor()
 
+        if self._has_search_index(conn):
+            # LIKE on a trigram FTS5 column is answered from the index with the
+            # same matching rules; the join drops entries for replaced rows
+            try:
+                cursor.execute("""
+                    SELECT p.id, p.title, p.scientific_name, p.family, p.genus, p.url
+                    FROM flora_fts
+                    JOIN flora_plants p ON p.id = flora_fts.rowid
+                    WHERE flora_fts.scientific_name LIKE ?
+                    ORDER BY p.scientific_name
+                """, (f'%{search_term}%',))
+                return cursor.fetchall()
+            except sqlite3.OperationalError:
+                # Index built by an SQLite with the trigram tokenizer, but this
+                # one lacks it; scan instead
+                pass
+
         cursor.execute("""
             SELECT id, title, scientific_name, family, genus, url
             FROM flora_plants
@@ -102,13 +200,12 @@ class FloraDatabase:
         """, (f'%{search_term}%',))
 
         results = cursor.fetchall()
-        conn.close()
 
         return results
 
     def get_scientific_name_by_title(self, title: str) -> Optional[str]:
         """Get scientific name for a specific plant by its title."""
-        conn = sqlite3.connect(self.db_name)
+        conn = self._connect()
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -118,14 +215,15 @@ class FloraDatabase:
         """, (title,))
 
         result = cursor.fetchone()
-        conn.close()
 
         return result[0] if result else None
 
     def get_full_plant_info(self, scientific_name: str) -> Optional[Dict]:
         """Get complete information for a plant by scientific name."""
-        conn = sqlite3.connect(self.db_name)
+        conn = self._connect()
         cursor = conn.cursor()
+        # Row factory on this cursor only; the other queries return plain tuples
+        cursor.row_factory = sqlite3.Row
 
         cursor.execute("""
             SELECT *
@@ -135,35 +233,80 @@ class FloraDatabase:
 
         result = cursor.fetchone()
 
-        if result:
-            columns = [description[0] for description in cursor.description]
-            plant_info = dict(zip(columns, result))
-            conn.close()
-            return plant_info
+        return dict(result) if result else None
 
-        conn.close()
-        return None
+    def get_full_plant_info_many(self, scientific_names: List[str]) -> Dict[str, Dict]:
+        """Get complete information for several plants in as few queries as possible.
 
-    def export_scientific_names_to_csv(self, filename: str = "scientific_names.csv"):
-        """Export all scientific names to a CSV file."""
-        conn = sqlite3.connect(self.db_name)
+        Names are looked up in batches that fit SQLite's bound-parameter
+        limit. Returns a dict keyed by scientific name; names that are not
+        found are left out.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+
+        names = list(dict.fromkeys(scientific_names))
+        plants = {}
+        for start in range(0, len(names), self.MAX_QUERY_PARAMS):
+            batch = names[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ','.join('?' * len(batch))
+            cursor.execute(f"""
+                SELECT *
+                FROM flora_plants
+                WHERE scientific_name IN ({placeholders})
+                ORDER BY id
+            """, batch)
+            for row in cursor:
+                # Keep the first match, like get_full_plant_info
+                plants.setdefault(row['scientific_name'], dict(row))
+
+        return plants
+
+    # Shared by the DataFrame export and the streaming export
+    _EXPORT_QUERY = """
+        SELECT id, title, scientific_name, family, genus, species, complete
+        FROM flora_plants
+        WHERE scientific_name IS NOT NULL
+        ORDER BY scientific_name
+    """
 
-        df = pd.read_sql_query("""
-            SELECT id, title, scientific_name, family, genus, species, complete
-            FROM flora_plants
-            WHERE scientific_name IS NOT NULL
-            ORDER BY scientific_name
-        """, conn)
+    def export_scientific_names_to_csv(self, filename: str = "scientific_names.csv"):
+        """Export all scientific names to a CSV file and return them as a DataFrame."""
+        # pandas is only needed for this path, so it is not a module import
+        import pandas as pd
 
-        conn.close()
+        conn = self._connect()
+        df = pd.read_sql_query(self._EXPORT_QUERY, conn)
 
         df.to_csv(filename, index=False)
         print(f"Exported {len(df)} scientific names to '{filename}'")
         return df
 
+    def stream_scientific_names_to_csv(self, filename: str = "scientific_names.csv") -> int:
+        """Export all scientific names to a CSV file without loading them into memory.
+
+        Writes the same columns as export_scientific_names_to_csv, streaming the
+        rows in chunks, and returns the number of rows written.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute(self._EXPORT_QUERY)
+
+        count = 0
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow([description[0] for description in cursor.description])
+            while rows := cursor.fetchmany(10000):
+                writer.writerows(rows)
+                count += len(rows)
+
+        print(f"Exported {count} scientific names to '{filename}'")
+        return count
+
     def get_scientific_names_by_family(self, family: str) -> List[tuple]:
         """Get all scientific names from a specific plant family."""
-        conn = sqlite3.connect(self.db_name)
+        conn = self._connect()
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -174,34 +317,25 @@ class FloraDatabase:
         """, (family,))
 
         results = cursor.fetchall()
-        conn.close()
 
         return results
 
     def get_statistics(self):
         """Print database statistics."""
-        conn = sqlite3.connect(self.db_name)
+        conn = self._connect()
         cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) FROM flora_plants")
-        total = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM flora_plants WHERE complete = 1")
-        complete = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM flora_plants WHERE complete = 0")
-        incomplete = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM flora_plants WHERE scientific_name IS NOT NULL")
-        with_sci_name = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM flora_plants WHERE scientific_name IS NULL")
-        without_sci_name = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(DISTINCT family) FROM flora_plants WHERE family IS NOT NULL")
-        families = cursor.fetchone()[0]
-
-        conn.close()
+        # All counts in one pass over the table
+        cursor.execute("""
+            SELECT COUNT(*),
+                   COALESCE(SUM(complete = 1), 0),
+                   COALESCE(SUM(complete = 0), 0),
+                   COUNT(scientific_name),
+                   COUNT(*) - COUNT(scientific_name),
+                   COUNT(DISTINCT family)
+            FROM flora_plants
+        """)
+        total, complete, incomplete, with_sci_name, without_sci_name, families = cursor.fetchone()
 
         print(f"\nDatabase Statistics:")
         print(f"  Total entries: {total}")
@@ -210,27 +344,6 @@ class FloraDatabase:
         print(f"  With scientific name: {with_sci_name}")
         print(f"  Without scientific name: {without_sci_name}")
         print(f"  Unique families: {families}")
-    def get_full_plant_info(self, scientific_name: str) -> Optional[Dict]:
-        """Get complete information for a plant by scientific name."""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT *
-            FROM flora_plants
-            WHERE scientific_name = ?
-        """, (scientific_name,))
-
-        result = cursor.fetchone()
-
-        if result:
-            columns = [description[0] for description in cursor.description]
-            plant_info = dict(zip(columns, result))
-            conn.close()
-            return plant_info
-
-        conn.close()
-        return None
 
     def mark_plant_complete(self, scientific_name: str, complete: bool = True) -> bool:
         """Mark a plant as complete or incomplete by scientific name.
@@ -242,7 +355,7 @@ class FloraDatabase:
         Returns:
             True if update was successful, False if plant not found
         """
-        conn = sqlite3.connect(self.db_name)
+        conn = self._connect()
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -253,7 +366,6 @@ class FloraDatabase:
 
         rows_affected = cursor.rowcount
         conn.commit()
-        conn.close()
 
         if rows_affected > 0:
             status = "complete" if complete else "incomplete"
@@ -284,6 +396,8 @@ class FloraDatabase:
 # Example usage demonstrations
 if __name__ == "__main__":
     db = FloraDatabase("flora_data.db")
+    # One-off migration; does nothing if the indexes already exist
+    db.migrate()
 
     # Example 1: Get all scientific names
     print("=" * 80)
@@ -364,12 +478,11 @@ if __name__ == "__main__":
     print("\n" + "=" * 80)
     print("EXAMPLE 8: Export scientific names to CSV")
     print("=" * 80)
-    try:
-        df = db.export_scientific_names_to_csv("scientific_names.csv")
-        print(f"\nFirst few rows:")
-        print(df.head())
-    except Exception as e:
-        print(f"Could not export (pandas might not be installed): {e}")
+    db.stream_scientific_names_to_csv("scientific_names.csv")
+    print(f"\nFirst few rows:")
+    with open("scientific_names.csv", newline='', encoding='utf-8') as f:
+        for row in itertools.islice(csv.reader(f), 6):
+            print("  " + ", ".join(row))
 
     # Example 9: Get statistics
     print("\n" + "=" * 80)
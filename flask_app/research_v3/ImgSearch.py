@@ -2,26 +2,96 @@
 Enhanced Plant Article Generator with JSON Configuration
 Includes heading rotation, robust content cleaning, and markdown to HTML conversion
 """
-import requests
+import atexit
 import json
+import logging
+import os
 import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from datetime import datetime
 import random
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional: faster parsing of Commons API responses
+    orjson = None
+
+try:
+    from .ArtGen import _plant_tag
+except ImportError:
+    from ArtGen import _plant_tag
+
+
+logger = logging.getLogger(__name__)
+
+# Shared read-only default for missing nested API fields
+_EMPTY: Dict[str, Any] = {}
+
+# HTML tags in Commons artist credits
+_HTML_TAG_RE = re.compile(r'<[^<]+?>')
+
+# Content cleaning patterns, compiled once
+_CITATION_RE = re.compile(r'\[\d+\]')
+_SOURCE_RE = re.compile(r'\[?[Ss]ource:?\s*\d+\]?')
+_REF_RE = re.compile(r'Ref:\s*\[[a-zA-Z0-9]+\]')
+_URL_RE = re.compile(r'\(\(https?://[^\)]+\)\)')
+_SERPAPI_RE = re.compile(r':\s*\{[^}]*serpapi[^}]*\}')
+_SOURCE_LINE_RE = re.compile(r"^Source: \[[0-9a-fA-F]+\]\n", re.MULTILINE)
+_MD_H3_RE = re.compile(r'^###\s+(.+)$', re.MULTILINE)
+_MD_H2_RE = re.compile(r'^##\s+(.+)$', re.MULTILINE)
+_MD_H1_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+_MD_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_MD_ITALIC_RE = re.compile(r'\*([^*]+?)\*')
+_PARA_SPLIT_RE = re.compile(r'\n\s*\n')
+_SENT_SPLIT_RE = re.compile(r'[.!?]+\s+')
+_SENT_START_RE = re.compile(r'[.!?]\s+([A-Z])')
+_INST_RE = re.compile(r'\[/?INST\]')
+_TRAILING_CITATION_RE = re.compile(r'\[\d+\]\s*$', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+_SPACES_RE = re.compile(r' {2,}')
+_EMPTY_P_RE = re.compile(r'<p>\s*</p>')
+_EMOJI_LABEL_RE = re.compile(r'([\U0001F300-\U0001F9FF])\s*\*\*([^*:]+):\*\*')
+
+# Characters a complete paragraph may end with
+_PARAGRAPH_END_CHARS = frozenset('.!?":)]>')
+# Block-level tags that keep a paragraph regardless of its punctuation
+_HTML_BLOCK_RE = re.compile(r'<(?:h2|h3|ul|li)>')
+# Lines that are already HTML and are not wrapped in <p>
+_HTML_LINE_PREFIXES = ('<h', '<ul', '<ol', '<div', '<img', '<p>', '</p>', '<br', '<li', '</ul>', '</ol>')
+# Inline markup that makes a plain line worth wrapping regardless of length
+_INLINE_TAG_RE = re.compile(r'<(?:strong>|em>|a )')
+# Substrings of scraped metadata lines that are dropped from content
+_METADATA_MARKERS = (
+    "{'id':", '{"id":', 'serpapi.com', 'json_endpoint',
+    'raw_html_file', 'created_at', 'processed_at',
+    'total_time_taken', 'google_ai_mode_url', 'status'
+)
+
 
 class ArticleConfig:
     """Load and manage article configuration from JSON"""
     
     def __init__(self, config_path: str = "article_config.json"):
         self.config_path = config_path
-        self.config = self._load_config()
+        self.config = _load_article_config(os.path.abspath(config_path))
+        # (title, subtitle) templates, so picking a heading needs no dict lookups
+        self._headings = [(heading["title"], heading["subtitle"])
+                          for heading in self.config["headings"]]
+        # Shuffled headings still to hand out before any repeats
+        self._heading_queue: List[tuple] = []
     
-    def _load_config(self) -> Dict:
-        """Load configuration from JSON file"""
+    @staticmethod
+    def _read_config(config_path: str) -> Dict:
+        """Read the JSON config, writing the default one if it does not exist"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
+            with open(config_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except FileNotFoundError:
             # Create default config if not exists
@@ -62,17 +132,23 @@ class ArticleConfig:
             }
             
             # Save default config
-            with open(self.config_path, 'w', encoding='utf-8') as f:
+            with open(config_path, 'w', encoding='utf-8') as f:
                 json.dump(default_config, f, indent=2)
             
             return default_config
     
     def get_random_heading(self, plant_name: str) -> Dict[str, str]:
-        """Get random title and subtitle with plant name inserted"""
-        heading = random.choice(self.config["headings"])
+        """Get random title and subtitle with plant name inserted
+
+        Headings are dealt from a shuffled deck, so a batch of articles
+        uses every heading once before any heading is repeated.
+        """
+        if not self._heading_queue:
+            self._heading_queue = random.sample(self._headings, len(self._headings))
+        title, subtitle = self._heading_queue.pop()
         return {
-            "title": heading["title"].format(plant_name=plant_name),
-            "subtitle": heading["subtitle"].format(plant_name=plant_name)
+            "title": title.format(plant_name=plant_name),
+            "subtitle": subtitle.format(plant_name=plant_name)
         }
     
     def get_image_settings(self) -> Dict[str, Any]:
@@ -93,47 +169,66 @@ class ArticleConfig:
         })
 
 
+@lru_cache(maxsize=8)
+def _load_article_config(config_path: str) -> Dict:
+    """Load an article config once per absolute path and process
+
+    The parsed dict is shared by every ArticleConfig for that path, so it
+    must be treated as read-only; edits to the file need a restart.
+    """
+    return ArticleConfig._read_config(config_path)
+
+
 class ContentCleaner:
     """Advanced content cleaning and formatting"""
     
     def __init__(self, cleaning_settings: Dict):
         self.settings = cleaning_settings
+        # Read once; the cleaning passes run for every section
+        self._remove_citations = cleaning_settings.get("remove_citations", True)
+        self._remove_incomplete = cleaning_settings.get("remove_incomplete_paragraphs", True)
+        self._min_paragraph_length = cleaning_settings.get("min_paragraph_length", 50)
+        self._remove_source_markers = cleaning_settings.get("remove_source_markers", True)
+        # Fallback content and repeated RAG answers (regeneration, A/B runs)
+        # hit the same input many times; cached per instance, so subclasses
+        # and their state always clean with their own pipeline
+        self._clean_cached = lru_cache(maxsize=256)(self._clean_content)
     
     def remove_citations(self, text: str) -> str:
         """Remove citation markers like [1], [2], etc."""
-        if not self.settings.get("remove_citations", True):
+        if not self._remove_citations:
             return text
         
         # Remove [number] citations
-        text = re.sub(r'\[\d+\]', '', text)
+        text = _CITATION_RE.sub('', text)
         
         # Remove source lines like "Source: [3]" or "[Source: 3]"
-        text = re.sub(r'\[?[Ss]ource:?\s*\d+\]?', '', text)
+        text = _SOURCE_RE.sub('', text)
         
         # Remove "Ref: [alphanumeric]"
-        text = re.sub(r'Ref:\s*\[[a-zA-Z0-9]+\]', '', text)
+        text = _REF_RE.sub('', text)
         
         # Remove URLs in parentheses like ((https://...))
-        text = re.sub(r'\(\(https?://[^\)]+\)\)', '', text)
+        text = _URL_RE.sub('', text)
         
         # Remove serpapi JSON references
-        text = re.sub(r':\s*\{[^}]*serpapi[^}]*\}', '', text)
-        text = re.sub(r"^Source: \[[0-9a-fA-F]+\]\n", "", text, flags=re.MULTILINE)
+        text = _SERPAPI_RE.sub('', text)
+        text = _SOURCE_LINE_RE.sub('', text)
 
         return text
     
     def convert_markdown_to_html(self, text: str) -> str:
         """Convert markdown syntax to HTML"""
         # Convert headers (## Header -> <h3>Header</h3>)
-        text = re.sub(r'^###\s+(.+)$', r'<h3>\1</h3>', text, flags=re.MULTILINE)
-        text = re.sub(r'^##\s+(.+)$', r'<h3>\1</h3>', text, flags=re.MULTILINE)
-        text = re.sub(r'^#\s+(.+)$', r'<h2>\1</h2>', text, flags=re.MULTILINE)
+        text = _MD_H3_RE.sub(r'<h3>\1</h3>', text)
+        text = _MD_H2_RE.sub(r'<h3>\1</h3>', text)
+        text = _MD_H1_RE.sub(r'<h2>\1</h2>', text)
         
         # Convert bold **text** to <strong>
-        text = re.sub(r'\*\*(.+?)\*\*', r'<br>\n<strong>\1</strong>', text)
+        text = _MD_BOLD_RE.sub(r'<br>\n<strong>\1</strong>', text)
         
         # Convert italic *text* to <em>
-        text = re.sub(r'\*([^*]+?)\*', r'<em>\1</em>', text)
+        text = _MD_ITALIC_RE.sub(r'<em>\1</em>', text)
         
         # Convert unordered lists (starting with * or -)
         lines = text.split('\n')
@@ -180,12 +275,7 @@ class ContentCleaner:
                 continue
             
             # Remove lines that are just metadata or JSON-like content
-            if any(pattern in stripped for pattern in [
-                "{'id':", '{"id":', 'serpapi.com', 'json_endpoint',
-                'raw_html_file', 'created_at', 'processed_at',
-                'total_time_taken', 'google_ai_mode_url', 'status',
-                'json_endpoint', 'raw_html_file'
-            ]):
+            if any(marker in stripped for marker in _METADATA_MARKERS):
                 continue
             
             # Remove lines that start with colons (metadata)
@@ -202,37 +292,31 @@ class ContentCleaner:
     
     def remove_incomplete_paragraphs(self, text: str) -> str:
         """Remove incomplete sentences and paragraphs"""
-        if not self.settings.get("remove_incomplete_paragraphs", True):
+        if not self._remove_incomplete:
             return text
         
-        min_length = self.settings.get("min_paragraph_length", 50)
+        min_length = self._min_paragraph_length
         
         # Split into paragraphs
-        paragraphs = re.split(r'\n\s*\n', text)
+        paragraphs = _PARA_SPLIT_RE.split(text)
         cleaned_paragraphs = []
         
-        for para in paragraphs:
-            # Skip if it's HTML tag
-            if para.strip().startswith('<') and para.strip().endswith('>'):
-                cleaned_paragraphs.append(para)
-                continue
+        for raw_para in paragraphs:
+            para = raw_para.strip()
             
-            # Keep HTML blocks
-            if '<h2>' in para or '<h3>' in para or '<ul>' in para or '<li>' in para:
-                cleaned_paragraphs.append(para)
+            # Keep HTML tags and HTML blocks as they are
+            if (para.startswith('<') and para.endswith('>')) or _HTML_BLOCK_RE.search(raw_para):
+                cleaned_paragraphs.append(raw_para)
                 continue
             
-            # Clean the paragraph
-            para = para.strip()
-            
             # Skip very short paragraphs
             if len(para) < min_length:
                 continue
             
             # Check if paragraph ends properly (with punctuation)
-            if para and not para[-1] in '.!?":)]>':
+            if para and para[-1] not in _PARAGRAPH_END_CHARS:
                 # Try to find last complete sentence
-                sentences = re.split(r'[.!?]+\s+', para)
+                sentences = _SENT_SPLIT_RE.split(para)
                 if len(sentences) > 1:
                     # Keep all but the last incomplete sentence
                     para = '. '.join(sentences[:-1]) + '.'
@@ -243,7 +327,7 @@ class ContentCleaner:
             # Check if paragraph starts with incomplete sentence
             if para and para[0].islower() and not para.startswith(('e.g.', 'i.e.')) and not para.startswith('<'):
                 # Try to find first complete sentence
-                match = re.search(r'[.!?]\s+([A-Z])', para)
+                match = _SENT_START_RE.search(para)
                 if match:
                     para = para[match.start() + 2:]
                 else:
@@ -255,19 +339,23 @@ class ContentCleaner:
     
     def clean_source_markers(self, text: str) -> str:
         """Remove source markers and references"""
-        if not self.settings.get("remove_source_markers", True):
+        if not self._remove_source_markers:
             return text
         
         # Remove [/INST] markers
-        text = re.sub(r'\[/?INST\]', '', text)
+        text = _INST_RE.sub('', text)
         
         # Remove standalone numbers in square brackets at end of paragraphs
-        text = re.sub(r'\[\d+\]\s*$', '', text, flags=re.MULTILINE)
+        text = _TRAILING_CITATION_RE.sub('', text)
         
         return text
     
     def clean_content(self, text: str) -> str:
-        """Apply all cleaning operations"""
+        """Apply all cleaning operations (memoized per input)"""
+        return self._clean_cached(text)
+    
+    def _clean_content(self, text: str) -> str:
+        """Run the cleaning pipeline uncached"""
         # Remove citations and URLs first
         text = self.remove_citations(text)
         text = self.clean_source_markers(text)
@@ -282,13 +370,13 @@ class ContentCleaner:
         text = self.remove_incomplete_paragraphs(text)
         
         # Remove multiple blank lines
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _BLANK_LINES_RE.sub('\n\n', text)
         
         # Remove trailing whitespace
         text = '\n'.join(line.rstrip() for line in text.split('\n'))
         
         # Clean up extra spaces
-        text = re.sub(r' {2,}', ' ', text)
+        text = _SPACES_RE.sub(' ', text)
         
         return text.strip()
 
@@ -304,14 +392,12 @@ class HTMLContentFormatter:
     
     def format_emoji_sections(self, text: str) -> str:
         """Format emoji label sections (💧 **Label:**)"""
-        pattern = r'([\U0001F300-\U0001F9FF])\s*\*\*([^*:]+):\*\*'
-        
         def replace_emoji_label(match):
             emoji = match.group(1)
             label = match.group(2)
             return f'\n\n<p><strong>{emoji} {label}:</strong></p>\n<p>'
         
-        text = re.sub(pattern, replace_emoji_label, text)
+        text = _EMOJI_LABEL_RE.sub(replace_emoji_label, text)
         return text
     
     def clean_content(self, content: str) -> str:
@@ -323,7 +409,7 @@ class HTMLContentFormatter:
         content = self.format_emoji_sections(content)
         
         # Ensure proper paragraph structure
-        content = re.sub(r'<p>\s*</p>', '', content)
+        content = _EMPTY_P_RE.sub('', content)
         
         lines = content.split('\n')
         formatted_lines = []
@@ -335,13 +421,13 @@ class HTMLContentFormatter:
                 continue
             
             # Check if line is already HTML
-            if stripped.startswith(('<h', '<ul', '<ol', '<div', '<img', '<p>', '</p>', '<br', '<li', '</ul>', '</ol>')):
+            if stripped.startswith(_HTML_LINE_PREFIXES):
                 formatted_lines.append(line)
             elif stripped.startswith('</'):  # Closing tags
                 formatted_lines.append(line)
             elif stripped and not stripped.startswith('<'):
                 # Wrap plain text in paragraph (but not if it contains HTML tags)
-                if '<strong>' in line or '<em>' in line or '<a ' in line:
+                if _INLINE_TAG_RE.search(line):
                     # Line contains inline HTML, wrap it
                     formatted_lines.append(f'<p>{stripped}</p>')
                 elif len(stripped) > 30:  # Only wrap substantial text
@@ -354,7 +440,7 @@ class HTMLContentFormatter:
         content = '\n'.join(formatted_lines)
         
         # Remove empty paragraphs again
-        content = re.sub(r'<p>\s*</p>', '', content)
+        content = _EMPTY_P_RE.sub('', content)
         
         return content
 
@@ -362,14 +448,112 @@ class HTMLContentFormatter:
 class WikiCommonsImageFetcher:
     """Fetch images from Wikimedia Commons for article sections"""
 
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = None, cache_ttl: int = 7 * 24 * 3600,
+                 cache_size: int = 1024):
+        """
+        Args:
+            cache_path: Optional JSON file that persists search results
+                between runs; written by save(), and at interpreter exit
+            cache_ttl: Seconds a cached search result stays valid
+            cache_size: Maximum number of cached searches; the least
+                recently used are evicted beyond it
+        """
         self.base_url = "https://commons.wikimedia.org/w/api.php"
         self.headers = {
             "User-Agent": "PlantArticleBot/1.0 (Educational purposes)"
         }
+        # Imported here so text-only generation (fetch_images=False) never loads requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        self._requests = requests
+
+        # One session for every search, so connections to Commons are kept alive
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Transient failures and rate limiting are retried with exponential backoff
+        retries = Retry(total=3, backoff_factor=0.5,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                        allowed_methods=["GET"], respect_retry_after_header=True)
+        self.session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20,
+                                                   max_retries=retries))
+        # (connect, read) timeouts in seconds
+        self.timeout = (3, 10)
+
+        # LRU of search results keyed on "limit:search_term", as [fetch time, results]
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, list]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_dirty = False
+        if cache_path:
+            if os.path.exists(cache_path):
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+                # Oldest first, so the newest survive the size bound
+                for key, entry in sorted(entries.items(), key=lambda item: item[1][0]):
+                    self._insert(key, entry)
+                self._prune_expired()
+            atexit.register(_save_on_exit, weakref.ref(self))
+
+    def _insert(self, key: str, entry: list):
+        """Add an entry as most recently used, evicting beyond cache_size (lock held)"""
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _prune_expired(self):
+        """Drop entries older than cache_ttl (lock held)"""
+        cutoff = time.time() - self.cache_ttl
+        for key in [key for key, entry in self._cache.items() if entry[0] < cutoff]:
+            del self._cache[key]
+
+    def _cached_search(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return a fresh cached result, or None"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.cache_ttl:
+                del self._cache[key]
+                self._cache_dirty = True
+                return None
+            self._cache.move_to_end(key)
+            # Callers may extend the list, so hand out a copy
+            return list(entry[1])
+
+    def _store_search(self, key: str, results: List[Dict[str, Any]]):
+        with self._cache_lock:
+            self._insert(key, [time.time(), results])
+            self._cache_dirty = True
+
+    def save(self):
+        """Write the unexpired cached searches to cache_path if they changed"""
+        if not self.cache_path:
+            return
+        with self._cache_lock:
+            if not self._cache_dirty:
+                return
+            self._prune_expired()
+            snapshot = dict(self._cache)
+            self._cache_dirty = False
+        # Serialize and write outside the lock so fetcher threads are not held up
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
 
     def search_images(self, search_term: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """Search for images on Wikimedia Commons"""
+        """Search for images on Wikimedia Commons
+
+        Successful results are cached per (search_term, limit) for cache_ttl
+        seconds; failed requests are not cached.
+        """
+        cache_key = f"{limit}:{search_term}"
+        cached = self._cached_search(cache_key)
+        if cached is not None:
+            return cached
+
         params = {
             "action": "query",
             "format": "json",
@@ -378,75 +562,93 @@ class WikiCommonsImageFetcher:
             "gsrsearch": search_term,
             "gsrlimit": limit,
             "prop": "imageinfo",
-            "iiprop": "url|size|mime|extmetadata",
+            # Only the fields read below, to keep the response small
+            "iiprop": "url|extmetadata",
+            "iiextmetadatafilter": "Artist|LicenseShortName",
             "iiurlwidth": 800
         }
 
         try:
-            response = requests.get(self.base_url, params=params, headers=self.headers)
+            response = self.session.get(self.base_url, params=params, timeout=self.timeout)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content) if orjson is not None else response.json()
 
             results = []
 
-            if "query" in data and "pages" in data["query"]:
-                for page_id, page_data in data["query"]["pages"].items():
-                    if "imageinfo" in page_data:
-                        img_info = page_data["imageinfo"][0]
-
-                        artist = ""
-                        if "extmetadata" in img_info and "Artist" in img_info["extmetadata"]:
-                            artist = img_info["extmetadata"]["Artist"].get("value", "")
-
-                        license_info = ""
-                        if "extmetadata" in img_info and "LicenseShortName" in img_info["extmetadata"]:
-                            license_info = img_info["extmetadata"]["LicenseShortName"].get("value", "")
-
-                        result = {
-                            "title": page_data.get("title", ""),
-                            "url": img_info.get("url", ""),
-                            "thumb_url": img_info.get("thumburl", ""),
-                            "descriptionurl": img_info.get("descriptionurl", ""),
-                            "artist": artist,
-                            "license": license_info
-                        }
-                        results.append(result)
-
-            return results
-
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching images: {e}")
+            pages = data.get("query", _EMPTY).get("pages", _EMPTY)
+            for page_data in pages.values():
+                if "imageinfo" not in page_data:
+                    continue
+                img_info = page_data["imageinfo"][0]
+                metadata = img_info.get("extmetadata") or _EMPTY
+                results.append({
+                    "title": page_data.get("title", ""),
+                    "url": img_info.get("url", ""),
+                    "thumb_url": img_info.get("thumburl", ""),
+                    "descriptionurl": img_info.get("descriptionurl", ""),
+                    "artist": metadata.get("Artist", _EMPTY).get("value", ""),
+                    "license": metadata.get("LicenseShortName", _EMPTY).get("value", "")
+                })
+
+            self._store_search(cache_key, results)
+            return list(results)
+
+        # ValueError covers a malformed body parsed by orjson
+        except (self._requests.exceptions.RequestException, ValueError) as e:
+            logger.error("Error fetching images: %s", e)
             return []
 
     def get_images_for_plant(self, plant_name: str) -> List[Dict[str, Any]]:
         """Get 5 images for a plant article"""
         images = self.search_images(plant_name, limit=5)
 
-        while len(images) < 5 and len(images) > 0:
-            images.append(images[0])
+        if images:
+            images += [images[0]] * (5 - len(images))
 
         return images[:5]
 
 
+def _save_on_exit(fetcher_ref: "weakref.ref[WikiCommonsImageFetcher]"):
+    """atexit hook; a weak reference so registering does not keep fetchers alive"""
+    fetcher = fetcher_ref()
+    if fetcher is not None:
+        fetcher.save()
+
+
 def create_image_html(image: Dict[str, Any], plant_name: str, section_name: str,
                      width: int, height: int, default_image: str) -> str:
     """Create HTML for image with standardized dimensions"""
-    artist = image.get('artist', 'Unknown')
-    if '<' in artist:
-        artist = re.sub('<[^<]+?>', '', artist)
+    html = _render_image_html(
+        image.get('thumb_url') or image.get('url', ''), image['descriptionurl'],
+        image.get('artist', 'Unknown'), image.get('license', ''),
+        plant_name, width, height, default_image)
+    return html.replace(_SECTION_PLACEHOLDER, section_name)
+
+
+# Stands in for the section name in cached image blocks
+_SECTION_PLACEHOLDER = '\x00section\x00'
+
+
+@lru_cache(maxsize=1024)
+def _render_image_html(image_url: str, description_url: str, artist: str, license_info: str,
+                       plant_name: str, width: int, height: int, default_image: str) -> str:
+    """Render an image block with a section name placeholder
 
-    license_info = image.get('license', '')
-    image_url = image.get('thumb_url') or image.get('url', '')
+    Memoized without the section, so an image repeated across the sections
+    of an article (or across regenerated articles) is rendered once.
+    """
+    if '<' in artist:
+        artist = _HTML_TAG_RE.sub('', artist)
 
     html = f'''<div class="article-image-container">
     <img class="img-fluid section-image"
          src="{image_url}"
-         alt="{plant_name} - {section_name}"
+         alt="{plant_name} - {_SECTION_PLACEHOLDER}"
          style="width: 100%; max-width: {width}px; height: {height}px; object-fit: cover; display: block; margin: 0 auto;"
          onerror="this.src='{default_image}'">
     <span class="caption text-muted">
         {plant_name} | Photo: {artist[:100]} |
-        <a href="{image['descriptionurl']}" target="_blank" rel="noopener">Source</a>
+        <a href="{description_url}" target="_blank" rel="noopener">Source</a>
         {f" | License: {license_info}" if license_info else ""}
     </span>
 </div>
@@ -458,6 +660,36 @@ def create_image_html(image: Dict[str, Any], plant_name: str, section_name: str,
 class EnhancedPlantArticleGenerator:
     """Generate structured plant articles with proper formatting and cleaning"""
 
+    # Section heading and RAG query template, in article order
+    SECTIONS = [
+        ("Introduction",
+         "Write an engaging introduction about {plant_name}, including its origin and significance"),
+        ("Fascinating Facts",
+         "What are the most interesting botanical facts about {plant_name}?"),
+        ("Care & Cultivation",
+         "How do you care for and cultivate {plant_name}? Include watering, light, soil, and propagation."),
+        ("Benefits & Traditional Uses",
+         "What are the medicinal, ecological, and cultural benefits of {plant_name}?"),
+        ("Conclusion",
+         "Summarize the key points about {plant_name}"),
+    ]
+
+    # Jekyll front matter, filled in per article
+    FRONT_MATTER_TEMPLATE = """---
+layout: post
+title: "{title}"
+subtitle: "{subtitle}"
+date: {date}
+background: '/img/posts/{background:02d}.jpg'
+categories: [South African Plants, Botany, Plant Care]
+tags: [{tag}, indigenous-plants, plant-guide]
+---
+
+"""
+
+    # Optional image block, heading and body of one section
+    SECTION_TEMPLATE = '{image}<h2 class="section-heading">{section_name}</h2>\n{content}'
+
     def __init__(self, rag_system=None, fetch_images=True, config_path="article_config.json"):
         self.rag_system = rag_system
         self.fetch_images = fetch_images
@@ -475,112 +707,158 @@ class EnhancedPlantArticleGenerator:
         self.image_width = image_settings["width"]
         self.image_height = image_settings["height"]
         self.default_image = image_settings["default_fallback"]
+        # Shuffled header backgrounds (/img/posts/01..17), dealt like the headings
+        self._background_queue: List[int] = []
+
+    def generate_section_content(self, section_name: str, plant_name: str,
+                                 research_data: List[Dict], query: str = None,
+                                 default_content: str = None) -> str:
+        """Generate and clean the body text of a section"""
+        if self.rag_system and research_data and query:
+            result = self.rag_system.query(query, k=10, max_new_tokens=400, temperature=0.75)
+            content = result['answer']
+        else:
+            content = default_content or f"Information about {plant_name} for {section_name}."
+
+        return self.formatter.clean_content(content)
 
     def generate_section(self, section_name: str, plant_name: str, 
                         research_data: List[Dict], image: Dict = None,
-                        query: str = None, default_content: str = None) -> str:
-        """Generic section generator"""
-        section_html = []
+                        query: str = None, default_content: str = None,
+                        content: str = None) -> str:
+        """Generic section generator
 
+        content may hold body text already produced by generate_section_content.
+        """
+        image_html = ''
         if image:
-            section_html.append(create_image_html(
+            image_html = create_image_html(
                 image, plant_name, section_name,
                 self.image_width, self.image_height, self.default_image
-            ))
+            ) + '\n'
 
-        section_html.append(f'<h2 class="section-heading">{section_name}</h2>')
-
-        if self.rag_system and research_data and query:
-            result = self.rag_system.query(query, k=10, max_new_tokens=400, temperature=0.75)
-            content = result['answer']
-        else:
-            content = default_content or f"Information about {plant_name} for {section_name}."
+        if content is None:
+            content = self.generate_section_content(
+                section_name, plant_name, research_data, query, default_content)
 
-        formatted_content = self.formatter.clean_content(content)
-        section_html.append(formatted_content)
+        return self.SECTION_TEMPLATE.format(
+            image=image_html, section_name=section_name, content=content)
 
-        return '\n'.join(section_html)
+    def _section_queries(self, plant_name: str) -> List[str]:
+        """RAG query for each section, in article order"""
+        return [query.format(plant_name=plant_name) for _, query in self.SECTIONS]
 
     def generate_full_article(self, plant_name: str, research_data: List[Dict],
-                            include_front_matter: bool = True) -> str:
-        """Generate complete article with all sections"""
-        # Fetch images
-        images = []
-        if self.fetch_images:
-            print(f"Fetching images for {plant_name}...")
+                            include_front_matter: bool = True,
+                            date: Optional[datetime] = None) -> str:
+        """Generate complete article with all sections
+
+        See iter_full_article; this joins its chunks into one string.
+        """
+        return ''.join(self.iter_full_article(plant_name, research_data,
+                                              include_front_matter, date))
+
+    def iter_full_article(self, plant_name: str, research_data: List[Dict],
+                          include_front_matter: bool = True,
+                          date: Optional[datetime] = None) -> Iterator[str]:
+        """Yield the article chunk by chunk: front matter, then each section
+
+        With a RAG system the image search and the section answers are
+        independent, so they run concurrently before the first chunk is
+        yielded. Without one every section is a cheap template, so images are
+        fetched inline and each section is rendered only when it is yielded.
+        date defaults to now; batch callers can pass one shared date.
+        """
+        queries = self._section_queries(plant_name)
+        images: List[Optional[Dict]] = []
+        contents: List[Optional[str]] = [None] * len(self.SECTIONS)
+        if self.rag_system and research_data:
+            images, contents = self._fetch_images_and_answers(plant_name, research_data, queries)
+        elif self.fetch_images:
+            logger.info("Fetching images for %s...", plant_name)
             images = self.image_fetcher.get_images_for_plant(plant_name)
-            print(f"Found {len(images)} images")
+            logger.info("Found %d images", len(images))
 
-        while len(images) < 5:
-            images.append(None)
+        images += [None] * (5 - len(images))
 
         # Get random heading
         heading = self.config.get_random_heading(plant_name)
-        date = datetime.now()
+        if not self._background_queue:
+            self._background_queue = random.sample(range(1, 18), 17)
+        background = self._background_queue.pop()
+        if date is None:
+            date = datetime.now()
 
         # Generate Jekyll front matter
         if include_front_matter:
-            front_matter = f"""---
-layout: post
-title: "{heading['title']}"
-subtitle: "{heading['subtitle']}"
-date: {date.strftime('%Y-%m-%d %H:%M:%S')}
-background: '/img/posts/{random.randint(1, 17):02d}.jpg'
-categories: [South African Plants, Botany, Plant Care]
-tags: [{plant_name.lower()}, indigenous-plants, plant-guide]
----
-
-"""
-        else:
-            front_matter = ""
-
-        # Generate sections
-        sections = [
-            self.generate_section(
-                "Introduction", plant_name, research_data, images[0],
-                query=f"Write an engaging introduction about {plant_name}, including its origin and significance"
-            ),
-            self.generate_section(
-                "Fascinating Facts", plant_name, research_data, images[1],
-                query=f"What are the most interesting botanical facts about {plant_name}?"
-            ),
-            self.generate_section(
-                "Care & Cultivation", plant_name, research_data, images[2],
-                query=f"How do you care for and cultivate {plant_name}? Include watering, light, soil, and propagation."
-            ),
-            self.generate_section(
-                "Benefits & Traditional Uses", plant_name, research_data, images[3],
-                query=f"What are the medicinal, ecological, and cultural benefits of {plant_name}?"
-            ),
-            self.generate_section(
-                "Conclusion", plant_name, research_data, images[4],
-                query=f"Summarize the key points about {plant_name}"
-            )
-        ]
-
-        article_body = '\n\n'.join(sections)
-        full_article = front_matter + article_body
-
-        return full_article
+            yield self.FRONT_MATTER_TEMPLATE.format(
+                title=heading['title'], subtitle=heading['subtitle'],
+                date=date.strftime('%Y-%m-%d %H:%M:%S'),
+                background=background, tag=_plant_tag(plant_name))
+
+        # Sections, separated by a blank line
+        for i, ((section_name, _), query, image, content) in enumerate(
+                zip(self.SECTIONS, queries, images, contents)):
+            if i:
+                yield '\n\n'
+            yield self.generate_section(section_name, plant_name, research_data, image,
+                                        query=query, content=content)
+
+    def _fetch_images_and_answers(self, plant_name: str, research_data: List[Dict],
+                                  queries: List[str]):
+        """Run the image search alongside the RAG answers for every section"""
+        with ThreadPoolExecutor(max_workers=len(self.SECTIONS) + 1) as pool:
+            image_future = None
+            if self.fetch_images:
+                logger.info("Fetching images for %s...", plant_name)
+                image_future = pool.submit(self.image_fetcher.get_images_for_plant, plant_name)
+
+            batch_future = content_futures = None
+            if hasattr(self.rag_system, 'query_batch'):
+                # Every section answer from one batched LLM call
+                batch_future = pool.submit(self.rag_system.query_batch, queries,
+                                           k=10, max_new_tokens=400, temperature=0.75)
+            else:
+                content_futures = [
+                    pool.submit(self.generate_section_content, section_name, plant_name,
+                                research_data, query)
+                    for (section_name, _), query in zip(self.SECTIONS, queries)
+                ]
+
+            images = []
+            if image_future is not None:
+                images = image_future.result()
+                logger.info("Found %d images", len(images))
+            if batch_future is not None:
+                contents = [self.formatter.clean_content(result['answer'])
+                            for result in batch_future.result()]
+            else:
+                contents = [future.result() for future in content_futures]
+        return images, contents
 
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     generator = EnhancedPlantArticleGenerator(
         rag_system=None,
         fetch_images=True,
         config_path="article_config.json"
     )
 
-    article = generator.generate_full_article(
+    chunks = generator.iter_full_article(
         plant_name="Adiantum",
         research_data=[],
         include_front_matter=True
     )
 
     output_file = f'_posts/{datetime.now().strftime("%Y-%m-%d")}-adiantum.html'
+    length = 0
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(article)
+        for chunk in chunks:
+            f.write(chunk)
+            length += len(chunk)
 
     print(f"\nArticle generated: {output_file}")
-    print(f"Total length: {len(article)} characters")
+    print(f"Total length: {length} characters")
@@ -3,6 +3,7 @@ import numpy as np
 from sentence_transformers import SentenceTransformer
 from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
 import torch
+import threading
 from typing import List, Dict, Optional
 
 class RAGSystem:
@@ -23,6 +24,8 @@ class RAGSystem:
         self.tokenizer = None
         self.llm = None
         self.generator = None
+        # HF pipelines are not thread-safe; one generation runs at a time
+        self._llm_lock = threading.Lock()
 
         # FAISS index components
         self.index = None
@@ -40,8 +43,12 @@ class RAGSystem:
         """
         print(f"Loading LLM on device: {device}")
 
-        # Load tokenizer
+        # Load tokenizer; batched generation needs a pad token, on the left
+        # for decoder-only models
         self.tokenizer = AutoTokenizer.from_pretrained(self.llm_model_name)
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.tokenizer.padding_side = 'left'
 
         # Create text generation pipeline
         self.generator = pipeline(
@@ -100,6 +107,9 @@ class RAGSystem:
         # Format results
         results = []
         for i, idx in enumerate(indices[0]):
+            # FAISS pads with -1 when k exceeds the number of indexed texts
+            if idx < 0:
+                continue
             results.append({
                 'text': self.texts[idx],
                 'metadata': self.metadata[idx],
@@ -161,12 +171,8 @@ class RAGSystem:
         # Step 2: Generate context
         context = self.generate_context(retrieved_docs)
 
-        # Step 3: Create prompt
-        prompt = self._create_prompt(question, context)
-
-        # Step 4: Generate answer using LLM
-        print("Generating answer...")
-        answer = self._generate_answer(prompt, max_new_tokens, temperature)
+        # Step 3: Generate answer using LLM
+        answer = self.generate(question, context, max_new_tokens, temperature)
 
         return {
             'question': question,
@@ -176,6 +182,89 @@ class RAGSystem:
             'context': context
         }
 
+    def query_batch(self, questions: List[str], k: int = 5, max_new_tokens: int = 2000,
+                    temperature: float = 0.7) -> List[Dict]:
+        """
+        RAG pipeline for several questions: retrieve per question, generate in one batch
+
+        Args:
+            questions: User's questions
+            k: Number of documents to retrieve per question
+            max_new_tokens: Maximum number of tokens to generate per answer
+            temperature: Sampling temperature for generation
+
+        Returns:
+            One query()-style result dictionary per question
+        """
+        if self.generator is None:
+            raise ValueError("LLM not loaded. Call load_llm() first.")
+
+        print(f"Retrieving top {k} documents for {len(questions)} questions...")
+        retrieved = [self.retrieve(question, k=k) for question in questions]
+        contexts = [self.generate_context(docs) for docs in retrieved]
+        prompts = [self._create_prompt(question, context)
+                   for question, context in zip(questions, contexts)]
+
+        print(f"Generating {len(prompts)} answers...")
+        answers = self._generate_answers(prompts, max_new_tokens, temperature)
+
+        return [
+            {
+                'question': question,
+                'answer': answer,
+                'sources': [doc['metadata'] for doc in docs],
+                'retrieved_docs': docs,
+                'context': context
+            }
+            for question, answer, docs, context in zip(questions, answers, retrieved, contexts)
+        ]
+
+    def generate(self, question: str, context: str, max_new_tokens: int = 2000,
+                 temperature: float = 0.7) -> str:
+        """
+        Generate an answer from an already-built context, skipping retrieval
+
+        Lets several questions about the same subject share one retrieval.
+
+        Args:
+            question: User's question
+            context: Context string, e.g. from generate_context()
+            max_new_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature for generation
+
+        Returns:
+            Generated answer text
+        """
+        if self.generator is None:
+            raise ValueError("LLM not loaded. Call load_llm() first.")
+
+        prompt = self._create_prompt(question, context)
+
+        print("Generating answer...")
+        return self._generate_answer(prompt, max_new_tokens, temperature)
+
+    def generate_batch(self, questions: List[str], context: str, max_new_tokens: int = 2000,
+                       temperature: float = 0.7) -> List[str]:
+        """
+        Generate answers to several questions over one shared context in a single batch
+
+        Args:
+            questions: Questions to answer
+            context: Context string, e.g. from generate_context()
+            max_new_tokens: Maximum number of tokens to generate per answer
+            temperature: Sampling temperature for generation
+
+        Returns:
+            Generated answer text per question
+        """
+        if self.generator is None:
+            raise ValueError("LLM not loaded. Call load_llm() first.")
+
+        prompts = [self._create_prompt(question, context) for question in questions]
+
+        print(f"Generating {len(prompts)} answers...")
+        return self._generate_answers(prompts, max_new_tokens, temperature)
+
     def _create_prompt(self, question: str, context: str) -> str:
         """Create prompt for LLM (formatted for instruction-tuned models)"""
 
@@ -202,22 +291,28 @@ Answer:"""
     def _generate_answer(self, prompt: str, max_new_tokens: int,
                         temperature: float) -> str:
         """Generate answer using Hugging Face LLM"""
+        return self._generate_answers([prompt], max_new_tokens, temperature)[0]
+
+    def _generate_answers(self, prompts: List[str], max_new_tokens: int,
+                          temperature: float) -> List[str]:
+        """Generate answers for a batch of prompts using Hugging Face LLM"""
         try:
-            outputs = self.generator(
-                prompt,
-                max_new_tokens=max_new_tokens,
-                temperature=temperature,
-                do_sample=True if temperature > 0 else False,
-                top_p=0.95,
-                top_k=50,
-                return_full_text=False
-            )
-
-            answer = outputs[0]['generated_text'].strip()
-            return answer
+            with self._llm_lock:
+                outputs = self.generator(
+                    prompts,
+                    max_new_tokens=max_new_tokens,
+                    temperature=temperature,
+                    do_sample=True if temperature > 0 else False,
+                    top_p=0.95,
+                    top_k=50,
+                    return_full_text=False,
+                    batch_size=len(prompts)
+                )
+
+            return [output[0]['generated_text'].strip() for output in outputs]
 
         except Exception as e:
-            return f"Error generating answer: {str(e)}"
+            return [f"Error generating answer: {str(e)}"] * len(prompts)
 
     def save_index(self, filepath: str):
         """Save FAISS index to disk"""
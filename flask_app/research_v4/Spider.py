@@ -14,6 +14,7 @@ from dataclasses import dataclass
 from datetime import datetime
 import logging
 import io
+import re
 import PyPDF2
 import os
 import wikipediaapi
@@ -182,6 +183,10 @@ def wiki(plant_name=None):
 class EnhancedPlantSpider:
     """Enhanced Plant Spider with full JSON configuration support"""
 
+    # Boilerplate phrases that mark non-content text, matched in one regex pass
+    SKIP_PHRASES = ['cookie', 'privacy', 'subscribe', 'newsletter', 'advertisement', 'menu', 'navigation', 'share this', 'follow us', 'contact us']
+    _SKIP_PHRASES_RE = re.compile('|'.join(re.escape(phrase) for phrase in SKIP_PHRASES))
+
     def __init__(self, config: ConfigManager):
         """Initialize with configuration."""
         self.config = config
@@ -612,9 +617,7 @@ class EnhancedPlantSpider:
 
     def _is_content_text(self, text: str) -> bool:
         """Check if text is actual content."""
-        text_lower = text.lower()
-        skip_phrases = ['cookie', 'privacy', 'subscribe', 'newsletter', 'advertisement', 'menu', 'navigation', 'share this', 'follow us', 'contact us']
-        return not any(phrase in text_lower for phrase in skip_phrases)
+        return self._SKIP_PHRASES_RE.search(text.lower()) is None
 
     def _calculate_reliability(self, domain: str, content: str) -> float:
         """Calculate reliability score."""
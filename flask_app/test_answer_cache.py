@@ -0,0 +1,153 @@
+"""
+Test the research_v3 answer caches used by the article generator
+"""
+import os
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+# Add the parent directory to the Python path so we can import from research_v3
+sys.path.append(str(Path(__file__).parent))
+from research_v3.ArtGen import EnhancedPlantArticleGenerator
+
+RESEARCH = [{'content': 'Research notes ' * 20}]
+
+
+class PlantBlindEncoder:
+    """Worst case for the semantic cache: queries differing only in the plant
+    name embed identically"""
+
+    def encode(self, texts):
+        vectors = []
+        for text in texts:
+            text = text.replace('Aloe ferox', '').replace('Aloe vera', '')
+            seed = zlib.crc32(text.encode('utf-8'))
+            vectors.append(np.random.default_rng(seed).random(32, dtype='float32'))
+        return np.array(vectors)
+
+
+class ConstantEncoder:
+    """Every query embeds identically, so only the cache key tells them apart"""
+
+    def encode(self, texts):
+        return np.ones((len(texts), 8), dtype='float32')
+
+
+class FakeRAG:
+    """RAG system whose answers name the plant the question was about"""
+
+    def __init__(self):
+        self.embedding_model = PlantBlindEncoder()
+        self.calls = 0
+
+    def query(self, question, **params):
+        self.calls += 1
+        return {'answer': f'ANSWER: {question}'}
+
+
+class ContextRAG(FakeRAG):
+    """RAG system generating from a shared context that changes per retrieval"""
+
+    def __init__(self):
+        super().__init__()
+        self.embedding_model = ConstantEncoder()
+        self.retrievals = 0
+
+    def retrieve(self, query, k=5):
+        self.retrievals += 1
+        return [f'document {self.retrievals}']
+
+    def generate_context(self, docs):
+        return ' '.join(docs)
+
+    def generate(self, question, context, **params):
+        self.calls += 1
+        return f'ANSWER: {question}'
+
+
+class BatchRAG(ContextRAG):
+    """ContextRAG that can also answer every section in one batched call"""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = 0
+
+    def generate_batch(self, questions, context, **params):
+        self.batches += 1
+        return [f'ANSWER: {question}' for question in questions]
+
+
+def test_semantic_cache_isolates_plants():
+    """A cached answer for one plant is never served for another"""
+    rag = FakeRAG()
+    generator = EnhancedPlantArticleGenerator(rag, cache_threshold=0.97)
+
+    ferox = generator.generate_full_article('Aloe ferox', RESEARCH, include_front_matter=False)
+    vera = generator.generate_full_article('Aloe vera', RESEARCH, include_front_matter=False)
+
+    assert 'Aloe vera' not in ferox
+    assert 'Aloe ferox' not in vera
+    assert rag.calls == 10
+
+    # The same plant again is served entirely from the cache
+    again = generator.generate_full_article('Aloe ferox', RESEARCH, include_front_matter=False)
+    assert again == ferox
+    assert rag.calls == 10
+
+
+def test_semantic_cache_keeps_sections_apart():
+    """Sections never share answers; a section is reused under a new context"""
+    rag = ContextRAG()
+    generator = EnhancedPlantArticleGenerator(rag, cache_threshold=0.97)
+
+    first = generator.generate_full_article('Aloe ferox', RESEARCH, include_front_matter=False)
+    assert rag.calls == 5
+    for template, _ in EnhancedPlantArticleGenerator.SECTION_QUERIES.values():
+        assert template.format(plant_name='Aloe ferox') in first
+
+    # The second retrieval returns a different context: no exact hit, but the
+    # semantic tier still serves every section its own earlier answer
+    second = generator.generate_full_article('Aloe ferox', RESEARCH, include_front_matter=False)
+    assert second == first
+    assert rag.calls == 5
+
+
+def test_semantic_cache_persists_per_batch():
+    """The .npz file is written once a batch is done and reloads isolated"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'answers.npz')
+        rag = FakeRAG()
+        generator = EnhancedPlantArticleGenerator(rag, cache_threshold=0.97, cache_path=path)
+        generator.generate_articles(['Aloe ferox', 'Aloe vera'],
+                                    {'Aloe ferox': RESEARCH, 'Aloe vera': RESEARCH},
+                                    include_front_matter=False)
+        assert os.path.exists(path)
+
+        reloaded = EnhancedPlantArticleGenerator(rag, cache_threshold=0.97, cache_path=path)
+        vera = reloaded.generate_full_article('Aloe vera', RESEARCH, include_front_matter=False)
+        assert 'Aloe ferox' not in vera
+        assert rag.calls == 10
+
+
+def test_prefetched_answers_per_article():
+    """A plant repeated in a batch keeps its own prefetched answers"""
+    rag = BatchRAG()
+    generator = EnhancedPlantArticleGenerator(rag)
+    articles = generator.generate_articles(['Aloe ferox'] * 4, {'Aloe ferox': RESEARCH},
+                                           include_front_matter=False)
+
+    # Every article is built from its own batched answers, never an unbatched call
+    assert rag.calls == 0
+    assert rag.batches > 0
+    assert len(set(articles)) == 1
+
+
+if __name__ == "__main__":
+    test_semantic_cache_isolates_plants()
+    test_semantic_cache_keeps_sections_apart()
+    test_semantic_cache_persists_per_batch()
+    test_prefetched_answers_per_article()
+    print("All answer cache tests passed")
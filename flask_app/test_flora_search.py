@@ -0,0 +1,105 @@
+"""
+Test scientific-name search in research_v3.FloraDatabase, with and without
+the FTS index
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the parent directory to the Python path so we can import from research_v3
+sys.path.append(str(Path(__file__).parent))
+from research_v3.FloraDatabase import FloraDatabase
+
+NAMES = ["Adenia glauca", "Adenocline acuta", "Aloe ferox", "Aloe vera",
+         "Protea cynaroides", "Strelitzia reginae", "Aloidendron dichotomum"]
+TERMS = ["Adeno", "aloe", "oe", "a", "Protea cyn", "x", "_", "%"]
+
+
+def make_database(path):
+    """Minimal flora_plants table with a few known names"""
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE flora_plants (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL UNIQUE,
+            title TEXT,
+            scientific_name TEXT,
+            family TEXT,
+            genus TEXT,
+            complete BOOLEAN DEFAULT 0
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO flora_plants (url, title, scientific_name, genus) VALUES (?, ?, ?, ?)",
+        [(f"https://example.org/{i}", name, name, name.split()[0])
+         for i, name in enumerate(NAMES)])
+    conn.commit()
+    conn.close()
+
+
+def has_fts_table(path):
+    """Whether the FTS index exists, checked on a fresh connection"""
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'flora_fts'").fetchone() is not None
+    finally:
+        conn.close()
+
+
+def test_search_with_and_without_index():
+    """Reads never build the index, and the index gives the same results"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'flora.db')
+        make_database(path)
+        db = FloraDatabase(path)
+
+        scanned = {term: db.search_by_scientific_name(term) for term in TERMS}
+        assert not has_fts_table(path)
+
+        if not db.create_search_index():
+            print("FTS5 trigram tokenizer unavailable; only the scan was tested")
+            return
+        assert has_fts_table(path)
+        for term in TERMS:
+            assert db.search_by_scientific_name(term) == scanned[term], term
+
+        # Triggers keep the index in sync with later writes
+        conn = sqlite3.connect(path)
+        conn.execute("INSERT INTO flora_plants (url, title, scientific_name) "
+                     "VALUES ('https://example.org/new', 'Aloe', 'Aloe arborescens')")
+        conn.commit()
+        conn.close()
+        assert [row[2] for row in db.search_by_scientific_name("arbor")] == ["Aloe arborescens"]
+        db.close()
+
+
+def test_migrate_builds_lookup_indexes():
+    """Lookup indexes come from migrate(), never from a read"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'flora.db')
+        make_database(path)
+        db = FloraDatabase(path)
+
+        def index_names():
+            conn = sqlite3.connect(path)
+            try:
+                return {row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")}
+            finally:
+                conn.close()
+
+        db.check_if_complete("Aloe ferox")
+        assert not index_names()
+
+        db.migrate()
+        assert index_names() == {'idx_sci', 'idx_title', 'idx_family_sci', 'idx_complete_sci'}
+        db.close()
+
+
+if __name__ == "__main__":
+    test_search_with_and_without_index()
+    test_migrate_builds_lookup_indexes()
+    print("All flora search tests passed")
@@ -0,0 +1,93 @@
+"""
+Test how research_v2.generator shares research items between sections
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the Python path so we can import from research_v2
+sys.path.append(str(Path(__file__).parent))
+from research_v2 import generator as gen
+
+PLANT = "Aloe ferox"
+SECTIONS = ['general', 'characteristics', 'habitat', 'cultural']
+
+
+def make_generator(**kwargs):
+    """Generator without a summarization model (template fallback only)"""
+    with mock.patch.object(gen.ExpandedArticleGenerator, '_load_model'):
+        return gen.ExpandedArticleGenerator(**kwargs)
+
+
+def make_research(count, source="Source"):
+    """Distinct research items that all mention the plant and pass validation"""
+    return [{
+        'content': f"{PLANT} is a succulent plant species native to the Western Cape. "
+                   f"{source} {i} describes its habitat, soil and rainfall in detail. " * 8
+    } for i in range(count)]
+
+
+def test_max_chars_distribution():
+    """A capped section must not use up items it never returns"""
+    generator = make_generator()
+    research = make_research(8)
+
+    contents = [generator.extract_relevant_content(research, PLANT, section, max_items=3,
+                                                   max_chars=400)
+                for section in SECTIONS]
+
+    for section, content in zip(SECTIONS, contents):
+        print(f"{section}: {len(content)} characters")
+        assert 0 < len(content) <= 400, section
+    # Each capped section fills its budget from one item, so four are used
+    assert len(generator.used_content_hashes) == len(SECTIONS)
+
+
+def test_uncapped_dedup():
+    """Without a cap, sections still never share an item"""
+    generator = make_generator()
+    research = make_research(8)
+
+    contents = [generator.extract_relevant_content(research, PLANT, section, max_items=3)
+                for section in SECTIONS]
+
+    assert [content.count("Source ") // 8 for content in contents] == [3, 3, 2, 0]
+
+
+def test_zero_budget():
+    """A zero budget returns nothing and marks nothing"""
+    generator = make_generator()
+    assert generator.extract_relevant_content(make_research(2), PLANT, 'general',
+                                              max_chars=0) == ''
+    assert not generator.used_content_hashes
+
+
+def test_hashes_persisted_by_other_workers():
+    """Items another process recorded in the hash store are skipped"""
+    # Texts no other test uses, so no earlier test put them in the Bloom filter
+    research = make_research(2, source="Worker")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hashes.db')
+        generator = make_generator(hash_db_path=path)
+
+        # Another worker uses the first item after this generator has loaded
+        # the store, so this process has never seen its hash
+        used = gen.ExpandedArticleGenerator._hash_content(research[0]['content'].strip())
+        conn = sqlite3.connect(path)
+        conn.execute('INSERT INTO seen (h, ts) VALUES (?, 0)', (used,))
+        conn.commit()
+        conn.close()
+
+        content = generator.extract_relevant_content(research, PLANT, 'general')
+        assert content == research[1]['content'].strip()
+
+
+if __name__ == "__main__":
+    test_max_chars_distribution()
+    test_uncapped_dedup()
+    test_zero_budget()
+    test_hashes_persisted_by_other_workers()
+    print("All dedup tests passed")
@@ -0,0 +1,39 @@
+"""
+Test the botanical relevance check in research_v2.generator
+"""
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path so we can import from research_v2
+sys.path.append(str(Path(__file__).parent))
+from research_v2.generator import TopicValidator
+
+PLURAL_SENTENCES = [
+    "The flowers and seeds are collected in autumn each year",
+    "Roots and stems were harvested by local farmers today",
+    "Its leaves and petals fall as the blossoms fade in winter",
+    "Several varieties and hybrids are sold by nurseries worldwide",
+]
+
+UNRELATED_SENTENCES = [
+    "The committee published new information about the tax form",
+    "Traffic on the highway was heavy during the long weekend",
+]
+
+
+def test_plural_keywords_count():
+    """Plural keyword forms score like their singular keywords"""
+    for sentence in PLURAL_SENTENCES:
+        assert TopicValidator.is_botanical_content(sentence), sentence
+
+
+def test_unrelated_text_rejected():
+    """Text without botanical keywords (as whole words) is still rejected"""
+    for sentence in UNRELATED_SENTENCES:
+        assert not TopicValidator.is_botanical_content(sentence), sentence
+
+
+if __name__ == "__main__":
+    test_plural_keywords_count()
+    test_unrelated_text_rejected()
+    print("All topic validator tests passed")